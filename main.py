@@ -11,13 +11,31 @@ Usage:
 import asyncio
 import sys
 import uvicorn
+from decimal import Decimal
 from pathlib import Path
+from sqlalchemy import select
+
+from src.config import get_settings
+
+# src.database (including its models) and src.bot load settings and create the
+# engine/bot at import time, so they are imported inside the commands that need them
+
+# uvloop is not available on Windows
+USE_UVLOOP = sys.platform != "win32"
+
+
+def install_event_loop():
+    """Use uvloop as the asyncio event loop when the platform supports it."""
+    if USE_UVLOOP:
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 
 async def run_bot():
     """Run the Telegram bot."""
     from src.bot import bot, dp, setup_bot
-    from src.database import init_db
+    from src.database import init_db, warm_pool
 
     # Initialize database
     await init_db()
@@ -25,6 +43,9 @@ async def run_bot():
     # Auto-seed database if empty
     await auto_seed_if_empty()
 
+    # Open pool connections before the first updates arrive
+    await warm_pool()
+
     # Setup bot handlers
     setup_bot()
 
@@ -35,7 +56,6 @@ async def run_bot():
 
 async def auto_seed_if_empty():
     """Automatically seed database if it's empty."""
-    from sqlalchemy import select
     from src.database import async_session
     from src.database.models import City
 
@@ -50,41 +70,80 @@ async def auto_seed_if_empty():
 
 def run_api():
     """Run the API server."""
-    from src.config import get_settings
-    from src.api import create_app
+    settings = get_settings()
+
+    print(
+        f"🌐 Starting API server on {settings.api_host}:{settings.api_port} "
+        f"({settings.api_workers} workers)..."
+    )
+    uvicorn.run(
+        "src.api:create_app",
+        factory=True,
+        host=settings.api_host,
+        port=settings.api_port,
+        workers=settings.api_workers,
+        loop="uvloop" if USE_UVLOOP else "asyncio",
+        http="httptools",
+    )
+
 
+def create_api_server() -> uvicorn.Server:
+    """Create an API server to run on the current event loop."""
     settings = get_settings()
-    app = create_app()
 
     print(f"🌐 Starting API server on {settings.api_host}:{settings.api_port}...")
-    uvicorn.run(
-        app,
+    config = uvicorn.Config(
+        "src.api:create_app",
+        factory=True,
         host=settings.api_host,
         port=settings.api_port,
+        http="httptools",
     )
+    return uvicorn.Server(config)
 
 
 async def run_all():
     """Run both bot and API server."""
-    import threading
     from src.database import init_db
 
+    settings = get_settings()
+
     # Initialize database
     await init_db()
 
-    # Run API in a separate thread
-    api_thread = threading.Thread(target=run_api, daemon=True)
-    api_thread.start()
+    # A single worker shares the bot's event loop
+    if settings.api_workers <= 1:
+        server = create_api_server()
+        api_task = asyncio.create_task(server.serve())
+        bot_task = asyncio.create_task(run_bot())
+
+        # Polling replaces uvicorn's signal handlers, so whichever side stops first
+        # has to stop the other one explicitly
+        done, _ = await asyncio.wait({api_task, bot_task}, return_when=asyncio.FIRST_COMPLETED)
+        server.should_exit = True
+        bot_task.cancel()
+        await asyncio.gather(api_task, bot_task, return_exceptions=True)
+        for task in done:
+            task.result()
+        return
+
+    # Run API in a separate process so uvicorn can fork its workers
+    api_process = await asyncio.create_subprocess_exec(
+        sys.executable, str(Path(__file__).resolve()), "api"
+    )
 
-    # Run bot in main thread
-    await run_bot()
+    try:
+        await run_bot()
+    finally:
+        if api_process.returncode is None:
+            api_process.terminate()
+            await api_process.wait()
 
 
 async def seed_database():
     """Seed database with demo data."""
-    from decimal import Decimal
     from src.database import init_db, async_session
-    from src.database.models import City, Banya, BathMaster, User, UserRole, BanyaPhoto
+    from src.database.models import City, Banya, BathMaster, User, UserRole
 
     print("🌱 Seeding database...")
 
@@ -92,8 +151,6 @@ async def seed_database():
 
     async with async_session() as session:
         # Check if data already exists
-        from sqlalchemy import select
-
         result = await session.execute(select(City))
         if result.scalars().first():
             print("⚠️ Database already seeded!")
@@ -107,8 +164,6 @@ async def seed_database():
             City(name="Екатеринбург", region="Свердловская область"),
             City(name="Казань", region="Республика Татарстан"),
         ]
-        session.add_all(cities)
-        await session.flush()
 
         # Create demo owner
         owner = User(
@@ -118,8 +173,6 @@ async def seed_database():
             last_name="Бани",
             role=UserRole.BANYA_OWNER,
         )
-        session.add(owner)
-        await session.flush()
 
         # Create banyas
         banyas_data = [
@@ -127,7 +180,7 @@ async def seed_database():
                 "name": "Русские Бани на Пресне",
                 "description": "Настоящая русская баня с вековыми традициями. Профессиональные парильщики, дубовые веники.",
                 "address": "ул. Пресненский Вал, 15",
-                "city_id": cities[0].id,
+                "city": cities[0],
                 "price_per_hour": Decimal("3500"),
                 "min_hours": 2,
                 "max_guests": 8,
@@ -146,7 +199,7 @@ async def seed_database():
                 "name": "SPA Хаммам Восток",
                 "description": "Аутентичный турецкий хаммам с мраморными плитами и профессиональным скрабированием.",
                 "address": "Арбат, 25с1",
-                "city_id": cities[0].id,
+                "city": cities[0],
                 "price_per_hour": Decimal("4500"),
                 "min_hours": 2,
                 "max_guests": 6,
@@ -163,7 +216,7 @@ async def seed_database():
                 "name": "Финская Сауна Релакс",
                 "description": "Классическая финская сауна с березовыми вениками и охлаждающим бассейном.",
                 "address": "Невский проспект, 100",
-                "city_id": cities[1].id,
+                "city": cities[1],
                 "price_per_hour": Decimal("2800"),
                 "min_hours": 2,
                 "max_guests": 10,
@@ -181,7 +234,7 @@ async def seed_database():
                 "name": "Баня Купеческая",
                 "description": "Традиционная русская баня в купеческом стиле. Ледяная купель, берёзовые и дубовые веники.",
                 "address": "ул. Ленина, 45",
-                "city_id": cities[1].id,
+                "city": cities[1],
                 "price_per_hour": Decimal("3200"),
                 "min_hours": 3,
                 "max_guests": 12,
@@ -201,7 +254,7 @@ async def seed_database():
                 "name": "Сибирские Бани",
                 "description": "Настоящий сибирский пар! Кедровая бочка, травяные чаи, профессиональные парильщики.",
                 "address": "пр. Маркса, 12",
-                "city_id": cities[2].id,
+                "city": cities[2],
                 "price_per_hour": Decimal("2500"),
                 "min_hours": 2,
                 "max_guests": 8,
@@ -219,7 +272,7 @@ async def seed_database():
                 "name": "Уральские Термы",
                 "description": "Комплекс с русской баней, финской сауной и хаммамом. Всё в одном месте!",
                 "address": "ул. Малышева, 78",
-                "city_id": cities[3].id,
+                "city": cities[3],
                 "price_per_hour": Decimal("4000"),
                 "min_hours": 2,
                 "max_guests": 15,
@@ -243,7 +296,7 @@ async def seed_database():
                 "name": "Татарская Баня",
                 "description": "Уникальное сочетание русских и восточных традиций. Травяные веники, медовый массаж.",
                 "address": "ул. Баумана, 33",
-                "city_id": cities[4].id,
+                "city": cities[4],
                 "price_per_hour": Decimal("3000"),
                 "min_hours": 2,
                 "max_guests": 10,
@@ -260,11 +313,7 @@ async def seed_database():
             },
         ]
 
-        for banya_data in banyas_data:
-            banya = Banya(owner_id=owner.id, **banya_data)
-            session.add(banya)
-
-        await session.flush()
+        banyas = [Banya(owner=owner, **banya_data) for banya_data in banyas_data]
 
         # Create bath masters
         masters_users = [
@@ -290,12 +339,10 @@ async def seed_database():
                 role=UserRole.BATH_MASTER,
             ),
         ]
-        session.add_all(masters_users)
-        await session.flush()
 
         masters = [
             BathMaster(
-                user_id=masters_users[0].id,
+                user=masters_users[0],
                 bio="15 лет опыта в русской бане. Мастер дубового и берёзового веника.",
                 experience_years=15,
                 price_per_session=Decimal("3000"),
@@ -306,7 +353,7 @@ async def seed_database():
                 rating_count=89,
             ),
             BathMaster(
-                user_id=masters_users[1].id,
+                user=masters_users[1],
                 bio="Мастер финской сауны и русской бани. Специализация - ароматерапия.",
                 experience_years=8,
                 price_per_session=Decimal("2500"),
@@ -318,7 +365,7 @@ async def seed_database():
                 rating_count=56,
             ),
             BathMaster(
-                user_id=masters_users[2].id,
+                user=masters_users[2],
                 bio="Профессиональный мастер хаммама. Обучался в Турции.",
                 experience_years=10,
                 price_per_session=Decimal("3500"),
@@ -330,13 +377,17 @@ async def seed_database():
                 rating_count=72,
             ),
         ]
-        session.add_all(masters)
 
+        # Relationships let the unit of work order the inserts, so a single
+        # commit flushes everything without intermediate round trips.
+        # Banyas go first: each one cascades its city and owner, so rows are
+        # inserted in list order and get the same IDs as the step-by-step seed.
+        session.add_all([*banyas, *cities, owner, *masters_users, *masters])
         await session.commit()
 
         print("✅ Database seeded successfully!")
         print(f"   - {len(cities)} cities")
-        print(f"   - {len(banyas_data)} banyas")
+        print(f"   - {len(banyas)} banyas")
         print(f"   - {len(masters)} bath masters")
 
 
@@ -347,6 +398,7 @@ def main():
         sys.exit(1)
 
     command = sys.argv[1].lower()
+    install_event_loop()
 
     if command == "bot":
         asyncio.run(run_bot())
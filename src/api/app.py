@@ -1,27 +1,56 @@
+import re
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
+from starlette.responses import Response
 
+from src.api.middleware import StaticCORSMiddleware
+from src.api.responses import FastJSONResponse
 from src.api.routes import banyas, bookings, users, masters
+from src.config import get_settings
+from src.database import engine, warm_pool
+
+
+# Content-hashed file names such as app.3f2a9c1b.js never change in place
+HASHED_ASSET_RE = re.compile(r"\.[0-9a-f]{8,}\.\w+$")
+
+
+class CachedStaticFiles(StaticFiles):
+    """Static files with long-lived browser caching for content-hashed assets."""
+
+    def file_response(self, full_path, *args, **kwargs) -> Response:
+        response = super().file_response(full_path, *args, **kwargs)
+        if HASHED_ASSET_RE.search(Path(full_path).name):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            # Revalidated with the ETag/Last-Modified that StaticFiles sends
+            response.headers["Cache-Control"] = "no-cache"
+        return response
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open database connections on startup and close them on shutdown."""
+    await warm_pool()
+    yield
+    await engine.dispose()
 
 
 def create_app() -> FastAPI:
     """Create and configure FastAPI application."""
+    settings = get_settings()
+
     app = FastAPI(
         title="Banya Bot API",
         description="API for Telegram Mini App - Sauna booking service",
         version="0.1.0",
+        default_response_class=FastJSONResponse,
+        lifespan=lifespan,
     )
 
     # CORS middleware
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=["*"],  # In production, specify exact origins
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
+    app.add_middleware(StaticCORSMiddleware)
 
     # Include routers
     app.include_router(banyas.router, prefix="/api/banyas", tags=["Banyas"])
@@ -31,12 +60,24 @@ def create_app() -> FastAPI:
 
     # Mount static files for Mini App
     static_path = Path(__file__).parent.parent.parent / "webapp" / "dist"
-    if static_path.exists():
-        app.mount("/app", StaticFiles(directory=str(static_path), html=True), name="webapp")
+    if settings.serve_static and static_path.exists():
+        app.mount(
+            "/app", CachedStaticFiles(directory=str(static_path), html=True), name="webapp"
+        )
 
     @app.get("/health")
     async def health_check():
         """Health check endpoint."""
         return {"status": "ok"}
 
+    @app.get("/health/pool")
+    async def pool_status():
+        """Database connection pool usage."""
+        return {
+            "size": engine.pool.size(),
+            "checked_in": engine.pool.checkedin(),
+            "checked_out": engine.pool.checkedout(),
+            "overflow": engine.pool.overflow(),
+        }
+
     return app
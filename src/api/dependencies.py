@@ -0,0 +1,42 @@
+from fastapi import Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.cache import cache_get, cache_set
+from src.database import User, get_db
+
+USER_CACHE_TTL = 300  # seconds
+
+
+def user_cache_key(telegram_id: int) -> str:
+    return f"user:tg:{telegram_id}"
+
+
+async def get_cached_user_id(telegram_id: int) -> int | None:
+    """Get the user ID for a Telegram ID from the cache only."""
+    cached = await cache_get(user_cache_key(telegram_id))
+    return int(cached) if cached is not None else None
+
+
+async def lookup_user_id(db: AsyncSession, telegram_id: int) -> int | None:
+    """Resolve a Telegram ID to a user ID, checking the cache first."""
+    user_id = await get_cached_user_id(telegram_id)
+    if user_id is not None:
+        return user_id
+
+    result = await db.execute(select(User.id).where(User.telegram_id == telegram_id))
+    user_id = result.scalar_one_or_none()
+    if user_id is not None:
+        await cache_set(user_cache_key(telegram_id), user_id, USER_CACHE_TTL)
+    return user_id
+
+
+async def get_user_id(
+    telegram_id: int = Query(..., description="User's Telegram ID"),
+    db: AsyncSession = Depends(get_db),
+) -> int:
+    """Dependency resolving the requesting user's ID or failing with 404."""
+    user_id = await lookup_user_id(db, telegram_id)
+    if user_id is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user_id
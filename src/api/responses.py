@@ -0,0 +1,36 @@
+import hashlib
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from starlette.responses import JSONResponse
+
+
+def _default(obj: Any) -> Any:
+    """Serialize types orjson doesn't handle natively."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson-backed response that also serializes Decimal values."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def cacheable_json_response(request: Request, payload: bytes | str, max_age: int) -> Response:
+    """JSON response with an ETag, answering 304 when the client's copy is current."""
+    if isinstance(payload, str):
+        payload = payload.encode()
+
+    etag = f'W/"{hashlib.sha1(payload).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age}"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    return Response(payload, media_type="application/json", headers=headers)
@@ -1,20 +1,53 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from sqlalchemy import Integer, cast, select, tuple_
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import get_db, Banya, City, BanyaPhoto
+from src.cache import TTLCache
+from src.database import get_db, Banya, City, BanyaPhoto, Booking
+from src.database.models import BANYA_FEATURE_COLUMNS, BookingStatus
 from src.api.schemas import BanyaResponse, BanyaListResponse, CityResponse
 
 router = APIRouter()
 
+CITIES_CACHE_TTL = 300  # seconds
+
+BANYA_DETAIL_OPTIONS = (selectinload(Banya.photos), selectinload(Banya.bath_masters))
+
+# Opening hours and pricing rarely change, so slot lookups can reuse them briefly
+banya_hours_cache = TTLCache(ttl=5)
+
+# All feature booleans folded into one BanyaFeature bitmask column
+BANYA_FEATURES = sum(
+    cast(getattr(Banya, column), Integer) * int(flag)
+    for flag, column in BANYA_FEATURE_COLUMNS.items()
+)
+
+_cities_cache = {"value": None, "expires_at": 0.0}
+_cities_lock = asyncio.Lock()
+
 
 @router.get("/cities", response_model=List[CityResponse])
 async def get_cities(db: AsyncSession = Depends(get_db)):
     """Get all available cities."""
-    result = await db.execute(select(City).order_by(City.name))
-    cities = result.scalars().all()
+    if _cities_cache["expires_at"] > time.monotonic():
+        return _cities_cache["value"]
+
+    async with _cities_lock:
+        # Another request may have refreshed the cache while we waited
+        if _cities_cache["expires_at"] > time.monotonic():
+            return _cities_cache["value"]
+
+        result = await db.execute(select(City).order_by(City.name))
+        cities = [CityResponse.model_validate(city) for city in result.scalars()]
+
+        _cities_cache["value"] = cities
+        _cities_cache["expires_at"] = time.monotonic() + CITIES_CACHE_TTL
+
     return cities
 
 
@@ -28,12 +61,29 @@ async def get_banyas(
     has_russian_banya: Optional[bool] = Query(None),
     has_finnish_sauna: Optional[bool] = Query(None),
     has_hammam: Optional[bool] = Query(None),
+    after_rating: Optional[float] = Query(None, description="Rating of the last banya seen"),
+    after_id: Optional[int] = Query(None, description="ID of the last banya seen"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     db: AsyncSession = Depends(get_db),
 ):
     """Get banyas with filters."""
-    query = select(Banya).where(Banya.is_active == True)
+    main_photo_url = (
+        select(BanyaPhoto.url)
+        .where(BanyaPhoto.banya_id == Banya.id, BanyaPhoto.is_main == True)
+        .limit(1)
+        .scalar_subquery()
+    )
+    query = select(
+        Banya.id,
+        Banya.name,
+        Banya.address,
+        Banya.price_per_hour,
+        Banya.rating,
+        Banya.rating_count,
+        BANYA_FEATURES.label("features"),
+        main_photo_url.label("main_photo_url"),
+    ).where(Banya.is_active == True)
 
     if city_id:
         query = query.where(Banya.city_id == city_id)
@@ -52,37 +102,21 @@ async def get_banyas(
     if has_hammam is not None:
         query = query.where(Banya.has_hammam == has_hammam)
 
-    query = query.order_by(Banya.rating.desc()).offset(skip).limit(limit)
-
-    result = await db.execute(query)
-    banyas = result.scalars().all()
-
-    # Get main photos
-    response = []
-    for banya in banyas:
-        photo_result = await db.execute(
-            select(BanyaPhoto)
-            .where(BanyaPhoto.banya_id == banya.id, BanyaPhoto.is_main == True)
-            .limit(1)
-        )
-        main_photo = photo_result.scalar_one_or_none()
-
-        response.append(
-            BanyaListResponse(
-                id=banya.id,
-                name=banya.name,
-                address=banya.address,
-                price_per_hour=banya.price_per_hour,
-                rating=banya.rating,
-                rating_count=banya.rating_count,
-                has_russian_banya=banya.has_russian_banya,
-                has_finnish_sauna=banya.has_finnish_sauna,
-                has_hammam=banya.has_hammam,
-                main_photo_url=main_photo.url if main_photo else None,
-            )
+    # Keyset pagination: continue after the last (rating, id) of the previous page
+    if (after_rating is None) != (after_id is None):
+        raise HTTPException(
+            status_code=422, detail="after_rating and after_id must be given together"
         )
+    if after_id is not None:
+        query = query.where(tuple_(Banya.rating, Banya.id) < (after_rating, after_id))
+    else:
+        # An offset on top of a cursor would skip rows after it
+        query = query.offset(skip)
+
+    query = query.order_by(Banya.rating.desc(), Banya.id.desc()).limit(limit)
 
-    return response
+    result = await db.execute(query)
+    return [BanyaListResponse.model_validate(row) for row in result.mappings()]
 
 
 @router.get("/{banya_id}", response_model=BanyaResponse)
@@ -90,7 +124,7 @@ async def get_banya(banya_id: int, db: AsyncSession = Depends(get_db)):
     """Get banya details by ID."""
     result = await db.execute(
         select(Banya)
-        .options(selectinload(Banya.photos), selectinload(Banya.bath_masters))
+        .options(*BANYA_DETAIL_OPTIONS)
         .where(Banya.id == banya_id)
     )
     banya = result.scalar_one_or_none()
@@ -120,11 +154,20 @@ async def get_available_slots(
     db: AsyncSession = Depends(get_db),
 ):
     """Get available time slots for a specific date."""
-    from datetime import datetime
-
-    banya = await db.get(Banya, banya_id)
-    if not banya:
-        raise HTTPException(status_code=404, detail="Banya not found")
+    banya = banya_hours_cache.get(banya_id)
+    if banya is None:
+        result = await db.execute(
+            select(
+                Banya.opening_time,
+                Banya.closing_time,
+                Banya.min_hours,
+                Banya.price_per_hour,
+            ).where(Banya.id == banya_id)
+        )
+        banya = result.one_or_none()
+        if not banya:
+            raise HTTPException(status_code=404, detail="Banya not found")
+        banya_hours_cache.set(banya_id, banya)
 
     # Parse date
     try:
@@ -132,40 +175,33 @@ async def get_available_slots(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format")
 
-    # Generate all possible slots
     open_hour = int(banya.opening_time.split(":")[0])
     close_hour = int(banya.closing_time.split(":")[0])
-    all_slots = [f"{h:02d}:00" for h in range(open_hour, close_hour - banya.min_hours + 1)]
 
     # Get existing bookings for this date
-    from src.database import Booking
-    from src.database.models import BookingStatus
-
+    day_start = datetime.combine(selected_date, datetime.min.time())
+    day_end = day_start + timedelta(days=1)
     result = await db.execute(
-        select(Booking).where(
+        select(Booking.start_time, Booking.duration_hours).where(
             Booking.banya_id == banya_id,
-            Booking.date == datetime.combine(selected_date, datetime.min.time()),
+            Booking.date >= day_start,
+            Booking.date < day_end,
             Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED]),
         )
     )
-    bookings = result.scalars().all()
-
-    # Filter out booked slots
-    booked_hours = set()
-    for booking in bookings:
-        start_hour = int(booking.start_time.split(":")[0])
-        for h in range(start_hour, start_hour + booking.duration_hours):
-            booked_hours.add(h)
-
-    available_slots = []
-    for slot in all_slots:
-        hour = int(slot.split(":")[0])
-        # Check if all hours for min_duration are available
-        is_available = all(
-            h not in booked_hours for h in range(hour, hour + banya.min_hours)
-        )
-        if is_available:
-            available_slots.append(slot)
+
+    # Booked hours as a bitmask: bit N is set when hour N is taken
+    booked = 0
+    for start_time, duration_hours in result:
+        booked |= ((1 << duration_hours) - 1) << int(start_time.split(":", 1)[0])
+
+    # A slot is available if all hours for min_duration are free
+    needed = (1 << banya.min_hours) - 1
+    available_slots = [
+        f"{hour:02d}:00"
+        for hour in range(open_hour, close_hour - banya.min_hours + 1)
+        if not (booked >> hour) & needed
+    ]
 
     return {
         "date": date,
@@ -1,122 +1,218 @@
+import base64
+import binascii
 from typing import List
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_db, Booking, Banya, User, BathMaster
 from src.database.models import BookingStatus
+from src.api.dependencies import get_cached_user_id, get_user_id
 from src.api.schemas import BookingCreate, BookingResponse
 
 router = APIRouter()
 
+bookings_adapter = TypeAdapter(List[BookingResponse])
+
+
+def encode_cursor(booking: Booking) -> str:
+    """Encode the position of a booking in the user's booking list."""
+    raw = f"{booking.date.isoformat()}|{booking.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        date_str, booking_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(date_str), int(booking_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 
 @router.post("", response_model=BookingResponse)
 async def create_booking(
     booking_data: BookingCreate,
-    telegram_id: int = Query(..., description="User's Telegram ID"),
+    user_id: int = Depends(get_user_id),
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new booking."""
-    # Get user
-    result = await db.execute(select(User).where(User.telegram_id == telegram_id))
-    user = result.scalar_one_or_none()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    # Get banya
-    banya = await db.get(Banya, booking_data.banya_id)
-    if not banya:
+    # Get banya and bath master (if specified) in one query
+    result = await db.execute(
+        select(
+            Banya.is_active,
+            Banya.price_per_hour,
+            BathMaster.id,
+            BathMaster.is_available,
+            BathMaster.price_per_session,
+        )
+        .select_from(Banya)
+        .outerjoin(BathMaster, BathMaster.id == booking_data.bath_master_id)
+        .where(Banya.id == booking_data.banya_id)
+    )
+    row = result.one_or_none()
+    if not row:
         raise HTTPException(status_code=404, detail="Banya not found")
 
-    if not banya.is_active:
+    banya_active, price_per_hour, master_id, master_available, price_per_session = row
+
+    if not banya_active:
         raise HTTPException(status_code=400, detail="Banya is not available")
 
     # Calculate prices
-    banya_price = banya.price_per_hour * booking_data.duration_hours
+    banya_price = price_per_hour * booking_data.duration_hours
     master_price = None
     total_price = banya_price
 
-    # Get bath master if specified
     if booking_data.bath_master_id:
-        master = await db.get(BathMaster, booking_data.bath_master_id)
-        if not master:
+        if master_id is None:
             raise HTTPException(status_code=404, detail="Bath master not found")
-        if not master.is_available:
+        if not master_available:
             raise HTTPException(status_code=400, detail="Bath master is not available")
-        master_price = master.price_per_session
+        master_price = price_per_session
         total_price += master_price
 
-    # Create booking
-    booking = Booking(
-        user_id=user.id,
-        banya_id=booking_data.banya_id,
-        bath_master_id=booking_data.bath_master_id,
-        date=booking_data.date,
-        start_time=booking_data.start_time,
-        duration_hours=booking_data.duration_hours,
-        guests_count=booking_data.guests_count,
-        banya_price=banya_price,
-        master_price=master_price,
-        total_price=total_price,
-        user_notes=booking_data.user_notes,
-        status=BookingStatus.PENDING,
+    # Create booking and get the stored row back in the same statement
+    result = await db.execute(
+        insert(Booking)
+        .values(
+            user_id=user_id,
+            banya_id=booking_data.banya_id,
+            bath_master_id=booking_data.bath_master_id,
+            date=booking_data.date,
+            start_time=booking_data.start_time,
+            duration_hours=booking_data.duration_hours,
+            guests_count=booking_data.guests_count,
+            banya_price=banya_price,
+            master_price=master_price,
+            total_price=total_price,
+            user_notes=booking_data.user_notes,
+            status=BookingStatus.PENDING,
+        )
+        .returning(Booking)
     )
-
-    db.add(booking)
+    booking = result.scalar_one()
     await db.commit()
-    await db.refresh(booking)
 
     return booking
 
 
 @router.get("", response_model=List[BookingResponse])
 async def get_user_bookings(
-    telegram_id: int = Query(..., description="User's Telegram ID"),
+    user_id: int = Depends(get_user_id),
     status: BookingStatus | None = Query(None),
-    skip: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page"),
+    skip: int = Query(0, ge=0, description="Ignored when cursor is given"),
     limit: int = Query(20, ge=1, le=100),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get user's bookings."""
-    # Get user
-    result = await db.execute(select(User).where(User.telegram_id == telegram_id))
-    user = result.scalar_one_or_none()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    query = (
-        select(Booking)
-        .options(selectinload(Booking.banya), selectinload(Booking.bath_master))
-        .where(Booking.user_id == user.id)
-    )
+    """Get user's bookings.
+
+    Pages are linked with keyset cursors: when more bookings may follow,
+    the X-Next-Cursor header holds the cursor for the next page.
+    """
+    query = select(Booking).where(Booking.user_id == user_id)
 
     if status:
         query = query.where(Booking.status == status)
 
-    query = query.order_by(Booking.date.desc()).offset(skip).limit(limit)
+    if cursor:
+        query = query.where(tuple_(Booking.date, Booking.id) < decode_cursor(cursor))
+    else:
+        # An offset on top of a cursor would skip rows after it
+        query = query.offset(skip)
+
+    query = query.order_by(Booking.date.desc(), Booking.id.desc()).limit(limit)
 
     result = await db.execute(query)
     bookings = result.scalars().all()
 
-    return bookings
+    headers = {}
+    if len(bookings) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(bookings[-1])
+
+    # Validate and serialize the page in one pass instead of per item
+    return Response(
+        bookings_adapter.dump_json(bookings_adapter.validate_python(bookings)),
+        media_type="application/json",
+        headers=headers,
+    )
 
 
 @router.get("/{booking_id}", response_model=BookingResponse)
 async def get_booking(booking_id: int, db: AsyncSession = Depends(get_db)):
     """Get booking by ID."""
+    booking = await db.get(Booking, booking_id)
+    if not booking:
+        raise HTTPException(status_code=404, detail="Booking not found")
+
+    return booking
+
+
+async def update_booking_status(
+    db: AsyncSession,
+    booking_id: int,
+    telegram_id: int,
+    allowed_statuses: List[BookingStatus],
+    new_status: BookingStatus,
+) -> Booking | None:
+    """Change status of a user's booking in a single UPDATE ... RETURNING.
+
+    Returns None if the booking doesn't exist, isn't owned by the user
+    or is not in one of the allowed statuses.
+    """
+    # Resolve the owner inside the UPDATE unless the user ID is cached
+    user_id = await get_cached_user_id(telegram_id)
+    if user_id is None:
+        user_id = select(User.id).where(User.telegram_id == telegram_id).scalar_subquery()
+
     result = await db.execute(
-        select(Booking)
-        .options(selectinload(Booking.banya), selectinload(Booking.bath_master))
-        .where(Booking.id == booking_id)
+        update(Booking)
+        .where(
+            Booking.id == booking_id,
+            Booking.user_id == user_id,
+            Booking.status.in_(allowed_statuses),
+        )
+        .values(status=new_status)
+        .returning(Booking)
     )
     booking = result.scalar_one_or_none()
+    await db.commit()
+    return booking
 
-    if not booking:
+
+async def get_unchanged_booking(
+    db: AsyncSession,
+    booking_id: int,
+    telegram_id: int,
+    target_status: BookingStatus,
+    detail: str,
+) -> Booking:
+    """Handle a status update that matched no rows.
+
+    Returns the booking if it already has the target status, so retried
+    requests succeed without another write. Otherwise raises the matching error.
+    """
+    # Booking and requesting user in one round trip
+    result = await db.execute(
+        select(Booking, User.id)
+        .outerjoin(User, User.telegram_id == telegram_id)
+        .where(Booking.id == booking_id)
+    )
+    row = result.one_or_none()
+    if not row:
         raise HTTPException(status_code=404, detail="Booking not found")
 
-    return booking
+    booking, user_id = row
+    if booking.user_id != user_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    if booking.status == target_status:
+        return booking
+
+    raise HTTPException(status_code=400, detail=detail)
 
 
 @router.patch("/{booking_id}/confirm", response_model=BookingResponse)
@@ -126,22 +222,13 @@ async def confirm_booking(
     db: AsyncSession = Depends(get_db),
 ):
     """Confirm a pending booking."""
-    booking = await db.get(Booking, booking_id)
+    booking = await update_booking_status(
+        db, booking_id, telegram_id, [BookingStatus.PENDING], BookingStatus.CONFIRMED
+    )
     if not booking:
-        raise HTTPException(status_code=404, detail="Booking not found")
-
-    # Verify user owns this booking
-    result = await db.execute(select(User).where(User.telegram_id == telegram_id))
-    user = result.scalar_one_or_none()
-    if not user or booking.user_id != user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    if booking.status != BookingStatus.PENDING:
-        raise HTTPException(status_code=400, detail="Booking cannot be confirmed")
-
-    booking.status = BookingStatus.CONFIRMED
-    await db.commit()
-    await db.refresh(booking)
+        booking = await get_unchanged_booking(
+            db, booking_id, telegram_id, BookingStatus.CONFIRMED, "Booking cannot be confirmed"
+        )
 
     return booking
 
@@ -153,21 +240,16 @@ async def cancel_booking(
     db: AsyncSession = Depends(get_db),
 ):
     """Cancel a booking."""
-    booking = await db.get(Booking, booking_id)
+    booking = await update_booking_status(
+        db,
+        booking_id,
+        telegram_id,
+        [BookingStatus.PENDING, BookingStatus.CONFIRMED],
+        BookingStatus.CANCELLED,
+    )
     if not booking:
-        raise HTTPException(status_code=404, detail="Booking not found")
-
-    # Verify user owns this booking
-    result = await db.execute(select(User).where(User.telegram_id == telegram_id))
-    user = result.scalar_one_or_none()
-    if not user or booking.user_id != user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-
-    if booking.status in [BookingStatus.CANCELLED, BookingStatus.COMPLETED]:
-        raise HTTPException(status_code=400, detail="Booking cannot be cancelled")
-
-    booking.status = BookingStatus.CANCELLED
-    await db.commit()
-    await db.refresh(booking)
+        booking = await get_unchanged_booking(
+            db, booking_id, telegram_id, BookingStatus.CANCELLED, "Booking cannot be cancelled"
+        )
 
     return booking
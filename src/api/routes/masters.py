@@ -1,17 +1,31 @@
+import hashlib
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import TypeAdapter
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.responses import cacheable_json_response
+from src.cache import cache_get, cache_set
 from src.database import get_db, BathMaster
+from src.database.models import BanyaBathMaster
 from src.api.schemas import BathMasterResponse
 
 router = APIRouter()
 
+MASTERS_CACHE_TTL = 60  # seconds
+MASTERS_MAX_AGE = 60  # seconds clients may reuse a response without revalidating
+
+masters_adapter = TypeAdapter(List[BathMasterResponse])
+
+MASTER_LIST_OPTIONS = (selectinload(BathMaster.user),)
+MASTER_DETAIL_OPTIONS = (selectinload(BathMaster.user), selectinload(BathMaster.reviews))
+
 
 @router.get("", response_model=List[BathMasterResponse])
 async def get_masters(
+    request: Request,
     min_rating: float | None = Query(None),
     specializes_russian: bool | None = Query(None),
     specializes_finnish: bool | None = Query(None),
@@ -23,9 +37,28 @@ async def get_masters(
     db: AsyncSession = Depends(get_db),
 ):
     """Get bath masters with filters."""
+    # Arbitrary-precision ratings would fragment the cache, so only cache
+    # requests with ratings rounded to one decimal
+    cache_key = None
+    if min_rating is None or round(min_rating, 1) == min_rating:
+        params = (
+            min_rating,
+            specializes_russian,
+            specializes_finnish,
+            specializes_hammam,
+            specializes_massage,
+            banya_id,
+            skip,
+            limit,
+        )
+        cache_key = "masters:" + hashlib.sha1(repr(params).encode()).hexdigest()
+        cached = await cache_get(cache_key)
+        if cached is not None:
+            return cacheable_json_response(request, cached, MASTERS_MAX_AGE)
+
     query = (
         select(BathMaster)
-        .options(selectinload(BathMaster.user))
+        .options(*MASTER_LIST_OPTIONS)
         .where(BathMaster.is_available == True)
     )
 
@@ -41,8 +74,6 @@ async def get_masters(
         query = query.where(BathMaster.specializes_massage == specializes_massage)
 
     if banya_id:
-        from src.database.models import BanyaBathMaster
-
         query = query.join(BanyaBathMaster).where(BanyaBathMaster.banya_id == banya_id)
 
     query = query.order_by(BathMaster.rating.desc()).offset(skip).limit(limit)
@@ -50,15 +81,19 @@ async def get_masters(
     result = await db.execute(query)
     masters = result.scalars().all()
 
-    return masters
+    payload = masters_adapter.dump_json(masters_adapter.validate_python(masters))
+    if cache_key:
+        await cache_set(cache_key, payload, MASTERS_CACHE_TTL)
+
+    return cacheable_json_response(request, payload, MASTERS_MAX_AGE)
 
 
 @router.get("/{master_id}", response_model=BathMasterResponse)
-async def get_master(master_id: int, db: AsyncSession = Depends(get_db)):
+async def get_master(master_id: int, request: Request, db: AsyncSession = Depends(get_db)):
     """Get bath master by ID."""
     result = await db.execute(
         select(BathMaster)
-        .options(selectinload(BathMaster.user), selectinload(BathMaster.reviews))
+        .options(*MASTER_DETAIL_OPTIONS)
         .where(BathMaster.id == master_id)
     )
     master = result.scalar_one_or_none()
@@ -66,4 +101,5 @@ async def get_master(master_id: int, db: AsyncSession = Depends(get_db)):
     if not master:
         raise HTTPException(status_code=404, detail="Bath master not found")
 
-    return master
+    payload = BathMasterResponse.model_validate(master).model_dump_json()
+    return cacheable_json_response(request, payload, MASTERS_MAX_AGE)
@@ -1,8 +1,9 @@
+from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import get_db, User
+from src.database import get_db, dialect_insert, User
 from src.database.models import UserRole
 from src.api.schemas import UserResponse, UserCreate
 
@@ -15,24 +16,8 @@ async def create_or_get_user(
     db: AsyncSession = Depends(get_db),
 ):
     """Create a new user or return existing one."""
-    result = await db.execute(
-        select(User).where(User.telegram_id == user_data.telegram_id)
-    )
-    user = result.scalar_one_or_none()
-
-    if user:
-        # Update user info
-        user.username = user_data.username
-        user.first_name = user_data.first_name
-        user.last_name = user_data.last_name
-        if user_data.phone:
-            user.phone = user_data.phone
-        await db.commit()
-        await db.refresh(user)
-        return user
-
-    # Create new user
-    user = User(
+    # Single race-free round trip: insert, or update the existing user's info
+    stmt = dialect_insert(User).values(
         telegram_id=user_data.telegram_id,
         username=user_data.username,
         first_name=user_data.first_name,
@@ -40,10 +25,21 @@ async def create_or_get_user(
         phone=user_data.phone,
         role=UserRole.CLIENT,
     )
-
-    db.add(user)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[User.telegram_id],
+        set_={
+            "username": stmt.excluded.username,
+            "first_name": stmt.excluded.first_name,
+            "last_name": stmt.excluded.last_name,
+            # Keep the stored phone unless a new one is provided
+            "phone": func.coalesce(func.nullif(stmt.excluded.phone, ""), User.phone),
+            "updated_at": datetime.utcnow(),
+        },
+    ).returning(User)
+
+    result = await db.execute(stmt)
+    user = result.scalar_one()
     await db.commit()
-    await db.refresh(user)
 
     return user
 
@@ -70,14 +66,17 @@ async def update_phone(
     db: AsyncSession = Depends(get_db),
 ):
     """Update user's phone number."""
-    result = await db.execute(select(User).where(User.telegram_id == telegram_id))
+    result = await db.execute(
+        update(User)
+        .where(User.telegram_id == telegram_id)
+        .values(phone=phone)
+        .returning(User)
+    )
     user = result.scalar_one_or_none()
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user.phone = phone
     await db.commit()
-    await db.refresh(user)
 
     return user
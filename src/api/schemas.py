@@ -1,7 +1,7 @@
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from src.database.models import BookingStatus, UserRole
 
@@ -27,8 +27,7 @@ class UserResponse(UserBase):
     rating_count: int
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # City schemas
@@ -37,8 +36,7 @@ class CityResponse(BaseModel):
     name: str
     region: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Banya schemas
@@ -90,8 +88,7 @@ class BanyaResponse(BanyaBase):
     provides_drinks: bool
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class BanyaListResponse(BaseModel):
@@ -101,13 +98,10 @@ class BanyaListResponse(BaseModel):
     price_per_hour: Decimal
     rating: float
     rating_count: int
-    has_russian_banya: bool
-    has_finnish_sauna: bool
-    has_hammam: bool
+    features: int  # BanyaFeature bitmask
     main_photo_url: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Bath Master schemas
@@ -132,8 +126,7 @@ class BathMasterResponse(BathMasterBase):
     specializes_aromatherapy: bool
     user: UserResponse
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Booking schemas
@@ -163,8 +156,7 @@ class BookingResponse(BaseModel):
     user_notes: Optional[str]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Review schemas
@@ -186,8 +178,7 @@ class ReviewResponse(BaseModel):
     created_at: datetime
     user: UserResponse
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Search/Filter schemas
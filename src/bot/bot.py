@@ -1,6 +1,11 @@
+from datetime import timedelta
 from aiogram import Bot, Dispatcher
 from aiogram.enums import ParseMode
 from aiogram.client.default import DefaultBotProperties
+from aiogram.fsm.storage.base import BaseStorage
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.fsm.storage.redis import RedisStorage
+from src.cache import redis
 from src.config import get_settings
 
 settings = get_settings()
@@ -10,7 +15,18 @@ bot = Bot(
     default=DefaultBotProperties(parse_mode=ParseMode.HTML),
 )
 
-dp = Dispatcher()
+# Abandoned booking flows expire instead of piling up in Redis
+FSM_TTL = timedelta(hours=1)
+
+
+def create_storage() -> BaseStorage:
+    """Keep FSM state in Redis when configured so it survives restarts and is shared."""
+    if redis is None:
+        return MemoryStorage()
+    return RedisStorage(redis, state_ttl=FSM_TTL, data_ttl=FSM_TTL)
+
+
+dp = Dispatcher(storage=create_storage())
 
 
 def setup_bot():
@@ -1,23 +1,70 @@
-from datetime import datetime, timedelta
+import asyncio
+import re
+import time
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from decimal import Decimal
+from typing import NamedTuple
 from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery
+from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.bot.utils import edit_message
+from src.cache import BatchLoader, TTLCache
 from src.database import async_session, User, Banya, Booking, BathMaster
 from src.database.models import BookingStatus
 from src.bot.keyboards.booking import (
+    BookingActionCallback,
+    DateCallback,
+    SlotCallback,
+    DurationCallback,
     get_booking_confirm_keyboard,
+    get_dates_keyboard,
     get_time_slots_keyboard,
     get_duration_keyboard,
 )
 
 router = Router(name="booking")
 
+BOOK_RE = re.compile(r"book_(\d+)$")
+
+STATUS_EMOJI = {
+    BookingStatus.PENDING: "⏳",
+    BookingStatus.CONFIRMED: "✅",
+    BookingStatus.CANCELLED: "❌",
+    BookingStatus.COMPLETED: "✔️",
+}
+
+# Statuses a booking may be moved to a given status from, as in the API
+STATUS_TRANSITIONS = {
+    BookingStatus.CONFIRMED: (BookingStatus.PENDING,),
+    BookingStatus.CANCELLED: (BookingStatus.PENDING, BookingStatus.CONFIRMED),
+}
+
+# Banya fields used by the booking flow; they change only on admin edits
+banya_cache = TTLCache(ttl=60)
+
+# Telegram ID -> user ID never changes once the user exists
+user_id_cache = TTLCache(ttl=3600, maxsize=10_000)
+
+# Date keyboards only change when the day rolls over
+dates_keyboard_cache: dict[tuple[date, int], InlineKeyboardMarkup] = {}
+_today = {"value": None, "expires_at": 0.0}
+
+
+class BanyaSnapshot(NamedTuple):
+    """Banya fields carried through the booking steps in FSM data."""
+
+    name: str
+    opening_time: str
+    closing_time: str
+    min_hours: int
+    price_per_hour: Decimal
+
 
 class BookingStates(StatesGroup):
     """States for booking process."""
@@ -30,54 +77,142 @@ class BookingStates(StatesGroup):
     confirming = State()
 
 
-def generate_time_slots(opening: str, closing: str, duration_hours: int = 2) -> list[str]:
+@lru_cache(maxsize=256)
+def generate_time_slots(opening: str, closing: str, duration_hours: int = 2) -> tuple[str, ...]:
     """Generate available time slots."""
-    slots = []
     open_hour = int(opening.split(":")[0])
     close_hour = int(closing.split(":")[0])
 
-    for hour in range(open_hour, close_hour - duration_hours + 1):
-        slots.append(f"{hour:02d}:00")
+    return tuple(
+        f"{hour:02d}:00" for hour in range(open_hour, close_hour - duration_hours + 1)
+    )
 
-    return slots
 
+@lru_cache(maxsize=512)
+def format_date(day: date) -> str:
+    """Format a booking date for display."""
+    return day.strftime("%d.%m.%Y")
 
-@router.callback_query(F.data.startswith("book_"))
-async def start_booking(callback: CallbackQuery, state: FSMContext):
-    """Start booking process."""
-    banya_id = int(callback.data.split("_")[1])
 
+async def load_banyas(banya_ids: list[int]) -> dict[int, BanyaSnapshot]:
+    """Load the booking fields of several banyas in one query."""
     async with async_session() as session:
-        banya = await session.get(Banya, banya_id)
-        if not banya:
-            await callback.answer("Баня не найдена", show_alert=True)
-            return
-
-    await state.update_data(banya_id=banya_id, banya_name=banya.name)
-
-    # Generate next 7 days
-    from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-
-    buttons = []
-    today = datetime.now().date()
-
-    for i in range(7):
-        date = today + timedelta(days=i)
-        day_name = ["Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Вс"][date.weekday()]
-        text = f"{day_name}, {date.day}.{date.month:02d}"
-        buttons.append(
-            [
-                InlineKeyboardButton(
-                    text=text, callback_data=f"date_{banya_id}_{date.isoformat()}"
-                )
-            ]
+        result = await session.execute(
+            select(
+                Banya.id,
+                Banya.name,
+                Banya.opening_time,
+                Banya.closing_time,
+                Banya.min_hours,
+                Banya.price_per_hour,
+            ).where(Banya.id.in_(banya_ids))
         )
+    return {row.id: BanyaSnapshot(*row[1:]) for row in result}
+
+
+# Concurrent cache misses, e.g. many users opening the same banya, share one query
+banya_loader = BatchLoader(load_banyas)
+
+
+async def get_banya(banya_id: int) -> BanyaSnapshot | None:
+    """Get the banya fields needed for booking, cached for a short time."""
+    banya = banya_cache.get(banya_id)
+    if banya is None:
+        banya = await banya_loader.load(banya_id)
+        if banya is not None:
+            banya_cache.set(banya_id, banya)
+    return banya
 
-    buttons.append([InlineKeyboardButton(text="❌ Отмена", callback_data=f"banya_{banya_id}")])
 
-    keyboard = InlineKeyboardMarkup(inline_keyboard=buttons)
+async def get_user_id(session: AsyncSession, telegram_id: int) -> int | None:
+    """Resolve a Telegram ID to a user ID, checking the cache first."""
+    user_id = user_id_cache.get(telegram_id)
+    if user_id is None:
+        result = await session.execute(select(User.id).where(User.telegram_id == telegram_id))
+        user_id = result.scalar_one_or_none()
+        if user_id is not None:
+            user_id_cache.set(telegram_id, user_id)
+    return user_id
 
-    await callback.message.edit_text(
+
+async def set_booking_status(booking_id: int, status: BookingStatus) -> BookingStatus | None:
+    """Move a booking to a status and return the status it ends up with.
+
+    Returns None if the booking doesn't exist. A status other than the requested
+    one means the booking can't move to it from its current state.
+    """
+    async with async_session() as session:
+        result = await session.execute(
+            update(Booking)
+            .where(Booking.id == booking_id, Booking.status.in_(STATUS_TRANSITIONS[status]))
+            .values(status=status)
+        )
+        if result.rowcount:
+            await session.commit()
+            return status
+
+        # Nothing to write: missing, already in this status (a redelivered callback) or not allowed
+        return await session.scalar(select(Booking.status).where(Booking.id == booking_id))
+
+
+def banya_from_state(data: dict, banya_id: int) -> BanyaSnapshot | None:
+    """Get the banya snapshot stored by start_booking, if it is for this banya."""
+    if data.get("banya_id") != banya_id or "banya" not in data:
+        return None
+    name, opening_time, closing_time, min_hours, price_per_hour = data["banya"]
+    return BanyaSnapshot(name, opening_time, closing_time, min_hours, Decimal(price_per_hour))
+
+
+def get_today() -> date:
+    """Get today's date, recomputed only once the current day is over."""
+    if time.time() >= _today["expires_at"]:
+        today = date.today()
+        _today["value"] = today
+        _today["expires_at"] = datetime.combine(
+            today + timedelta(days=1), datetime.min.time()
+        ).timestamp()
+    return _today["value"]
+
+
+def get_cached_dates_keyboard(banya_id: int) -> InlineKeyboardMarkup:
+    """Get the date keyboard for a banya, built once per day."""
+    today = get_today()
+    keyboard = dates_keyboard_cache.get((today, banya_id))
+    if keyboard is None:
+        for key in [key for key in dates_keyboard_cache if key[0] != today]:
+            del dates_keyboard_cache[key]
+        keyboard = get_dates_keyboard(banya_id, today)
+        dates_keyboard_cache[(today, banya_id)] = keyboard
+    return keyboard
+
+
+@router.callback_query(F.data.regexp(BOOK_RE).as_("match"))
+async def start_booking(callback: CallbackQuery, state: FSMContext, match: re.Match[str]):
+    """Start booking process."""
+    banya_id = int(match[1])
+
+    banya = await get_banya(banya_id)
+    if not banya:
+        await callback.answer("Баня не найдена", show_alert=True)
+        return
+
+    # Later steps read the banya from here; the price is a string to stay JSON-serializable
+    await state.update_data(
+        banya_id=banya_id,
+        banya_name=banya.name,
+        banya=[
+            banya.name,
+            banya.opening_time,
+            banya.closing_time,
+            banya.min_hours,
+            str(banya.price_per_hour),
+        ],
+    )
+
+    keyboard = get_cached_dates_keyboard(banya_id)
+
+    await edit_message(
+        callback.message,
         f"📅 <b>Бронирование: {banya.name}</b>\n\n"
         "Выберите дату:",
         reply_markup=keyboard,
@@ -86,27 +221,27 @@ async def start_booking(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
-@router.callback_query(F.data.startswith("date_"), BookingStates.selecting_date)
-async def select_date(callback: CallbackQuery, state: FSMContext):
+@router.callback_query(DateCallback.filter(), BookingStates.selecting_date)
+async def select_date(callback: CallbackQuery, state: FSMContext, callback_data: DateCallback):
     """Handle date selection."""
-    parts = callback.data.split("_")
-    banya_id = int(parts[1])
-    selected_date = parts[2]
+    banya_id = callback_data.banya_id
+    selected_date = date.fromordinal(callback_data.day).isoformat()
 
-    await state.update_data(selected_date=selected_date)
+    # Keep the day as an ordinal so FSM data stays JSON-serializable
+    data = await state.update_data(selected_date=selected_date, selected_day=callback_data.day)
 
-    async with async_session() as session:
-        banya = await session.get(Banya, banya_id)
-        if not banya:
-            await callback.answer("Баня не найдена", show_alert=True)
-            return
+    banya = banya_from_state(data, banya_id) or await get_banya(banya_id)
+    if not banya:
+        await callback.answer("Баня не найдена", show_alert=True)
+        return
 
     # Generate time slots
     slots = generate_time_slots(banya.opening_time, banya.closing_time, banya.min_hours)
 
-    keyboard = get_time_slots_keyboard(banya_id, slots, selected_date)
+    keyboard = get_time_slots_keyboard(banya_id, slots, callback_data.day)
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         f"🕐 <b>Выберите время:</b>\n\n"
         f"📅 Дата: {selected_date}\n"
         f"⏰ Работаем: {banya.opening_time} - {banya.closing_time}",
@@ -116,24 +251,23 @@ async def select_date(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
-@router.callback_query(F.data.startswith("slot_"), BookingStates.selecting_time)
-async def select_time(callback: CallbackQuery, state: FSMContext):
+@router.callback_query(SlotCallback.filter(), BookingStates.selecting_time)
+async def select_time(callback: CallbackQuery, state: FSMContext, callback_data: SlotCallback):
     """Handle time slot selection."""
-    parts = callback.data.split("_")
-    banya_id = int(parts[1])
-    selected_time = parts[3]
+    banya_id = callback_data.banya_id
+    selected_time = f"{callback_data.hour:02d}:00"
 
-    await state.update_data(selected_time=selected_time)
+    data = await state.update_data(selected_time=selected_time)
 
-    async with async_session() as session:
-        banya = await session.get(Banya, banya_id)
-        if not banya:
-            await callback.answer("Баня не найдена", show_alert=True)
-            return
+    banya = banya_from_state(data, banya_id) or await get_banya(banya_id)
+    if not banya:
+        await callback.answer("Баня не найдена", show_alert=True)
+        return
 
     keyboard = get_duration_keyboard(banya_id, banya.min_hours)
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         f"⏱ <b>Выберите продолжительность:</b>\n\n"
         f"💰 Цена: {banya.price_per_hour} ₽/час\n"
         f"⏰ Минимум: {banya.min_hours} часа",
@@ -143,163 +277,179 @@ async def select_time(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
-@router.callback_query(F.data.startswith("duration_"), BookingStates.selecting_duration)
-async def select_duration(callback: CallbackQuery, state: FSMContext):
+@router.callback_query(DurationCallback.filter(), BookingStates.selecting_duration)
+async def select_duration(
+    callback: CallbackQuery, state: FSMContext, callback_data: DurationCallback
+):
     """Handle duration selection."""
-    parts = callback.data.split("_")
-    banya_id = int(parts[1])
-    duration = int(parts[2])
+    banya_id = callback_data.banya_id
+    duration = callback_data.hours
 
-    data = await state.get_data()
-    await state.update_data(duration=duration)
+    data = await state.update_data(duration=duration)
 
-    async with async_session() as session:
-        banya = await session.get(Banya, banya_id)
-        if not banya:
-            await callback.answer("Баня не найдена", show_alert=True)
-            return
+    banya = banya_from_state(data, banya_id) or await get_banya(banya_id)
+    if not banya:
+        await callback.answer("Баня не найдена", show_alert=True)
+        return
 
-        # Get user
-        result = await session.execute(
-            select(User).where(User.telegram_id == callback.from_user.id)
-        )
-        user = result.scalar_one_or_none()
-
-        if not user:
-            await callback.answer("Пользователь не найден", show_alert=True)
-            return
-
-        # Calculate price
-        total_price = banya.price_per_hour * duration
-
-        # Create booking
-        booking = Booking(
-            user_id=user.id,
-            banya_id=banya_id,
-            date=datetime.fromisoformat(data["selected_date"]),
-            start_time=data["selected_time"],
-            duration_hours=duration,
-            guests_count=1,
-            banya_price=banya.price_per_hour * duration,
-            total_price=total_price,
-            status=BookingStatus.PENDING,
-        )
-        session.add(booking)
-        await session.commit()
-        await session.refresh(booking)
-
-    await state.update_data(booking_id=booking.id)
-
-    await callback.message.edit_text(
-        f"✅ <b>Подтверждение бронирования</b>\n\n"
-        f"🔥 <b>{banya.name}</b>\n"
-        f"📅 Дата: {data['selected_date']}\n"
-        f"🕐 Время: {data['selected_time']}\n"
-        f"⏱ Длительность: {duration} ч.\n"
-        f"👥 Гостей: 1\n\n"
-        f"💰 <b>Итого: {total_price} ₽</b>\n\n"
-        "Подтвердите бронирование:",
-        reply_markup=get_booking_confirm_keyboard(booking.id),
-    )
+    # Calculate price
+    total_price = banya.price_per_hour * duration
+
+    # The transaction commits when the block exits
+    async with async_session() as session, session.begin():
+        user_id = await get_user_id(session, callback.from_user.id)
+        if user_id is not None:
+            result = await session.execute(
+                insert(Booking)
+                .values(
+                    user_id=user_id,
+                    banya_id=banya_id,
+                    date=datetime.fromordinal(data["selected_day"]),
+                    start_time=data["selected_time"],
+                    duration_hours=duration,
+                    guests_count=1,
+                    banya_price=total_price,
+                    total_price=total_price,
+                    status=BookingStatus.PENDING,
+                )
+                .returning(Booking.id)
+            )
+            booking_id = result.scalar_one()
+
+    if user_id is None:
+        await callback.answer("Пользователь не найден", show_alert=True)
+        return
+
+    await state.update_data(booking_id=booking_id)
     await state.set_state(BookingStates.confirming)
-    await callback.answer()
+
+    await asyncio.gather(
+        edit_message(
+            callback.message,
+            f"✅ <b>Подтверждение бронирования</b>\n\n"
+            f"🔥 <b>{banya.name}</b>\n"
+            f"📅 Дата: {data['selected_date']}\n"
+            f"🕐 Время: {data['selected_time']}\n"
+            f"⏱ Длительность: {duration} ч.\n"
+            f"👥 Гостей: 1\n\n"
+            f"💰 <b>Итого: {total_price} ₽</b>\n\n"
+            "Подтвердите бронирование:",
+            reply_markup=get_booking_confirm_keyboard(booking_id),
+        ),
+        callback.answer(),
+    )
 
 
-@router.callback_query(F.data.startswith("confirm_booking_"), BookingStates.confirming)
-async def confirm_booking(callback: CallbackQuery, state: FSMContext):
+@router.callback_query(
+    BookingActionCallback.filter(F.action == "confirm"), BookingStates.confirming
+)
+async def confirm_booking(
+    callback: CallbackQuery, state: FSMContext, callback_data: BookingActionCallback
+):
     """Confirm the booking."""
-    booking_id = int(callback.data.split("_")[2])
+    booking_id = callback_data.booking_id
+
+    status = await set_booking_status(booking_id, BookingStatus.CONFIRMED)
+    if status is None:
+        await callback.answer("Бронирование не найдено", show_alert=True)
+        return
+    if status != BookingStatus.CONFIRMED:
+        await callback.answer("Это бронирование нельзя подтвердить", show_alert=True)
+        return
 
-    async with async_session() as session:
-        booking = await session.get(Booking, booking_id)
-        if not booking:
-            await callback.answer("Бронирование не найдено", show_alert=True)
-            return
-
-        booking.status = BookingStatus.CONFIRMED
-        await session.commit()
-
-    await callback.message.edit_text(
-        "🎉 <b>Бронирование подтверждено!</b>\n\n"
-        f"Номер брони: #{booking_id}\n\n"
-        "Мы отправим напоминание за день до визита.\n"
-        "Хорошего отдыха! 🔥"
-    )
     await state.clear()
-    await callback.answer("Бронирование подтверждено!")
+    await asyncio.gather(
+        edit_message(
+            callback.message,
+            "🎉 <b>Бронирование подтверждено!</b>\n\n"
+            f"Номер брони: #{booking_id}\n\n"
+            "Мы отправим напоминание за день до визита.\n"
+            "Хорошего отдыха! 🔥"
+        ),
+        callback.answer("Бронирование подтверждено!"),
+    )
 
 
-@router.callback_query(F.data.startswith("cancel_booking_"))
-async def cancel_booking(callback: CallbackQuery, state: FSMContext):
+@router.callback_query(BookingActionCallback.filter(F.action == "cancel"))
+async def cancel_booking(
+    callback: CallbackQuery, state: FSMContext, callback_data: BookingActionCallback
+):
     """Cancel the booking."""
-    booking_id = int(callback.data.split("_")[2])
+    booking_id = callback_data.booking_id
 
-    async with async_session() as session:
-        booking = await session.get(Booking, booking_id)
-        if booking:
-            booking.status = BookingStatus.CANCELLED
-            await session.commit()
+    status = await set_booking_status(booking_id, BookingStatus.CANCELLED)
+    if status is None:
+        await callback.answer("Бронирование не найдено", show_alert=True)
+        return
+    if status != BookingStatus.CANCELLED:
+        await callback.answer("Это бронирование нельзя отменить", show_alert=True)
+        return
 
-    await callback.message.edit_text("❌ Бронирование отменено.")
     await state.clear()
-    await callback.answer()
+    await asyncio.gather(
+        edit_message(callback.message, "❌ Бронирование отменено."),
+        callback.answer(),
+    )
 
 
-@router.message(Command("bookings"))
-async def show_my_bookings(message: Message):
-    """Show user's bookings."""
+async def build_bookings_text(telegram_id: int) -> str:
+    """Build the bookings list message for a Telegram user."""
+    # Outer joins from the user keep one row even without bookings,
+    # so registration and bookings are checked in a single round-trip
     async with async_session() as session:
-        # Get user
         result = await session.execute(
-            select(User).where(User.telegram_id == message.from_user.id)
-        )
-        user = result.scalar_one_or_none()
-
-        if not user:
-            await message.answer("Сначала запустите бота командой /start")
-            return
-
-        # Get bookings
-        result = await session.execute(
-            select(Booking)
-            .options(selectinload(Booking.banya))
-            .where(Booking.user_id == user.id)
+            select(
+                User.id.label("user_id"),
+                Booking.id,
+                Booking.status,
+                Booking.date,
+                Booking.start_time,
+                Booking.duration_hours,
+                Booking.total_price,
+                Banya.name.label("banya_name"),
+            )
+            .outerjoin(Booking, Booking.user_id == User.id)
+            .outerjoin(Banya, Booking.banya_id == Banya.id)
+            .where(User.telegram_id == telegram_id)
             .order_by(Booking.date.desc())
             .limit(10)
         )
-        bookings = result.scalars().all()
+        bookings = result.all()
 
     if not bookings:
-        await message.answer(
+        return "Сначала запустите бота командой /start"
+
+    user_id_cache.set(telegram_id, bookings[0].user_id)
+
+    if bookings[0].id is None:
+        return (
             "📅 <b>Мои бронирования</b>\n\n"
             "У вас пока нет бронирований.\n"
             "Найдите баню и забронируйте! 🔥"
         )
-        return
-
-    text = "📅 <b>Мои бронирования:</b>\n\n"
 
-    status_emoji = {
-        BookingStatus.PENDING: "⏳",
-        BookingStatus.CONFIRMED: "✅",
-        BookingStatus.CANCELLED: "❌",
-        BookingStatus.COMPLETED: "✔️",
-    }
+    parts = ["📅 <b>Мои бронирования:</b>\n\n"]
 
     for booking in bookings:
-        emoji = status_emoji.get(booking.status, "❓")
-        date_str = booking.date.strftime("%d.%m.%Y")
-        text += (
-            f"{emoji} <b>#{booking.id}</b> - {booking.banya.name}\n"
-            f"   📅 {date_str} в {booking.start_time}\n"
+        emoji = STATUS_EMOJI.get(booking.status, "❓")
+        parts.append(
+            f"{emoji} <b>#{booking.id}</b> - {booking.banya_name}\n"
+            f"   📅 {format_date(booking.date.date())} в {booking.start_time}\n"
             f"   ⏱ {booking.duration_hours} ч. • 💰 {booking.total_price} ₽\n\n"
         )
 
-    await message.answer(text)
+    return "".join(parts)
+
+
+@router.message(Command("bookings"))
+async def show_my_bookings(message: Message):
+    """Show user's bookings."""
+    await message.answer(await build_bookings_text(message.from_user.id))
 
 
 @router.callback_query(F.data == "my_bookings")
 async def my_bookings_callback(callback: CallbackQuery):
     """Handle my bookings callback."""
-    await show_my_bookings(callback.message)
+    # callback.message is the bot's own message, so the user comes from the callback
+    await callback.message.answer(await build_bookings_text(callback.from_user.id))
     await callback.answer()
@@ -1,50 +1,24 @@
+from datetime import datetime
+
 from aiogram import Router, F
 from aiogram.filters import Command, CommandStart
 from aiogram.types import Message, CallbackQuery
-from sqlalchemy import select
 
+from src.bot.utils import edit_message
 from src.bot.keyboards import get_main_keyboard, get_main_inline_keyboard
-from src.database import async_session, User
+from src.bot.handlers.booking import show_my_bookings, user_id_cache
+from src.bot.handlers.profile import show_profile
+from src.bot.handlers.search import search_masters, start_search
+from src.database import async_session, dialect_insert, User
 from src.database.models import UserRole
 
 router = Router(name="main")
 
+MAIN_KEYBOARD = get_main_keyboard()
+MAIN_INLINE_KEYBOARD = get_main_inline_keyboard()
 
-async def get_or_create_user(telegram_id: int, first_name: str, last_name: str | None, username: str | None) -> User:
-    """Get existing user or create new one."""
-    async with async_session() as session:
-        result = await session.execute(
-            select(User).where(User.telegram_id == telegram_id)
-        )
-        user = result.scalar_one_or_none()
-
-        if not user:
-            user = User(
-                telegram_id=telegram_id,
-                first_name=first_name,
-                last_name=last_name,
-                username=username,
-                role=UserRole.CLIENT,
-            )
-            session.add(user)
-            await session.commit()
-            await session.refresh(user)
-
-        return user
-
-
-@router.message(CommandStart())
-async def cmd_start(message: Message):
-    """Handle /start command."""
-    user = await get_or_create_user(
-        telegram_id=message.from_user.id,
-        first_name=message.from_user.first_name,
-        last_name=message.from_user.last_name,
-        username=message.from_user.username,
-    )
-
-    welcome_text = f"""
-👋 Привет, <b>{user.first_name}</b>!
+WELCOME_TEXT = """
+👋 Привет, <b>{name}</b>!
 
 Добро пожаловать в <b>Banya Bot</b> — твой помощник в поиске и бронировании бань!
 
@@ -57,13 +31,7 @@ async def cmd_start(message: Message):
 Выбери действие в меню ниже или открой приложение для полного функционала!
 """
 
-    await message.answer(welcome_text, reply_markup=get_main_keyboard())
-
-
-@router.message(Command("help"))
-async def cmd_help(message: Message):
-    """Handle /help command."""
-    help_text = """
+HELP_TEXT = """
 📖 <b>Справка по командам:</b>
 
 /start - Начать работу с ботом
@@ -78,53 +46,95 @@ async def cmd_help(message: Message):
 • Оставляйте отзывы после посещения
 • Подписка Premium даёт скидки и приоритетное бронирование
 """
-    await message.answer(help_text)
+
+
+async def get_or_create_user(telegram_id: int, first_name: str, last_name: str | None, username: str | None) -> User:
+    """Get existing user or create new one."""
+    # Single race-free round trip: insert, or refresh the existing user's Telegram info
+    stmt = dialect_insert(User).values(
+        telegram_id=telegram_id,
+        first_name=first_name,
+        last_name=last_name,
+        username=username,
+        role=UserRole.CLIENT,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[User.telegram_id],
+        set_={
+            "first_name": stmt.excluded.first_name,
+            "last_name": stmt.excluded.last_name,
+            "username": stmt.excluded.username,
+            "updated_at": datetime.utcnow(),
+        },
+    ).returning(User)
+
+    async with async_session() as session:
+        result = await session.execute(stmt)
+        user = result.scalar_one()
+        await session.commit()
+
+    user_id_cache.set(telegram_id, user.id)
+    return user
+
+
+@router.message(CommandStart())
+async def cmd_start(message: Message):
+    """Handle /start command."""
+    user = await get_or_create_user(
+        telegram_id=message.from_user.id,
+        first_name=message.from_user.first_name,
+        last_name=message.from_user.last_name,
+        username=message.from_user.username,
+    )
+
+    await message.answer(WELCOME_TEXT.format(name=user.first_name), reply_markup=MAIN_KEYBOARD)
+
+
+@router.message(Command("help"))
+async def cmd_help(message: Message):
+    """Handle /help command."""
+    await message.answer(HELP_TEXT)
 
 
 @router.message(Command("menu"))
 async def cmd_menu(message: Message):
     """Show main menu."""
-    await message.answer("📋 Главное меню:", reply_markup=get_main_inline_keyboard())
+    await message.answer("📋 Главное меню:", reply_markup=MAIN_INLINE_KEYBOARD)
 
 
 @router.message(F.text == "👤 Профиль")
 async def handle_profile_button(message: Message):
     """Handle profile button press."""
-    # Redirect to profile handler
-    from src.bot.handlers.profile import show_profile
     await show_profile(message)
 
 
 @router.message(F.text == "📅 Мои бронирования")
 async def handle_bookings_button(message: Message):
     """Handle bookings button press."""
-    from src.bot.handlers.booking import show_my_bookings
     await show_my_bookings(message)
 
 
 @router.message(F.text == "🔍 Найти баню")
 async def handle_search_button(message: Message):
     """Handle search button press."""
-    from src.bot.handlers.search import start_search
     await start_search(message)
 
 
 @router.message(F.text == "👨‍🍳 Пар-мастера")
 async def handle_masters_button(message: Message):
     """Handle masters button press."""
-    from src.bot.handlers.search import search_masters
     await search_masters(message)
 
 
 @router.callback_query(F.data == "cancel")
 async def handle_cancel(callback: CallbackQuery):
     """Handle cancel callback."""
-    await callback.message.edit_text("❌ Действие отменено")
+    await edit_message(callback.message, "❌ Действие отменено")
     await callback.answer()
 
 
 @router.callback_query(F.data == "main_menu")
 async def handle_main_menu(callback: CallbackQuery):
     """Return to main menu."""
-    await callback.message.edit_text("📋 Главное меню:", reply_markup=get_main_inline_keyboard())
+    await edit_message(callback.message, "📋 Главное меню:", reply_markup=MAIN_INLINE_KEYBOARD)
     await callback.answer()
@@ -1,44 +1,94 @@
 from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery
+from aiogram.types import (
+    Message,
+    CallbackQuery,
+    InlineKeyboardMarkup,
+    InlineKeyboardButton,
+    KeyboardButton,
+    ReplyKeyboardMarkup,
+)
 from aiogram.filters import Command
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update
 
+from src.bot.keyboards import get_main_keyboard
+from src.bot.utils import edit_message
 from src.database import async_session, User, Booking
 from src.database.models import BookingStatus
 
 router = Router(name="profile")
 
 
-@router.message(Command("profile"))
-async def show_profile(message: Message):
-    """Show user profile."""
+def build_profile_keyboard(is_premium: bool) -> InlineKeyboardMarkup:
+    """Build profile keyboard."""
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(text="📱 Изменить телефон", callback_data="edit_phone"),
+            ],
+            [
+                InlineKeyboardButton(
+                    text="👑 Подключить Premium" if not is_premium else "👑 Управление подпиской",
+                    callback_data="premium_info",
+                ),
+            ],
+            [
+                InlineKeyboardButton(text="🔙 Главное меню", callback_data="main_menu"),
+            ],
+        ]
+    )
+
+
+# Static keyboards are built once at import time
+PROFILE_KEYBOARDS = {False: build_profile_keyboard(False), True: build_profile_keyboard(True)}
+
+PREMIUM_KEYBOARD = InlineKeyboardMarkup(
+    inline_keyboard=[
+        [
+            InlineKeyboardButton(text="🔙 Назад", callback_data="profile"),
+        ],
+    ]
+)
+
+# Reply keyboard with contact request
+PHONE_REQUEST_KEYBOARD = ReplyKeyboardMarkup(
+    keyboard=[
+        [KeyboardButton(text="📱 Отправить номер", request_contact=True)],
+        [KeyboardButton(text="❌ Отмена")],
+    ],
+    resize_keyboard=True,
+    one_time_keyboard=True,
+)
+
+
+async def build_profile(telegram_id: int) -> tuple[str, InlineKeyboardMarkup | None]:
+    """Build the profile message and keyboard for a Telegram user."""
     async with async_session() as session:
         # Get user
         result = await session.execute(
-            select(User).where(User.telegram_id == message.from_user.id)
+            select(User).where(User.telegram_id == telegram_id)
         )
         user = result.scalar_one_or_none()
 
-        if not user:
-            await message.answer("Сначала запустите бота командой /start")
-            return
-
-        # Get booking stats
-        result = await session.execute(
-            select(func.count(Booking.id)).where(
-                Booking.user_id == user.id,
-                Booking.status == BookingStatus.COMPLETED,
+        if user:
+            # Get booking stats
+            result = await session.execute(
+                select(func.count(Booking.id)).where(
+                    Booking.user_id == user.id,
+                    Booking.status == BookingStatus.COMPLETED,
+                )
             )
-        )
-        completed_bookings = result.scalar() or 0
+            completed_bookings = result.scalar() or 0
 
-        result = await session.execute(
-            select(func.count(Booking.id)).where(
-                Booking.user_id == user.id,
-                Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED]),
+            result = await session.execute(
+                select(func.count(Booking.id)).where(
+                    Booking.user_id == user.id,
+                    Booking.status.in_([BookingStatus.PENDING, BookingStatus.CONFIRMED]),
+                )
             )
-        )
-        active_bookings = result.scalar() or 0
+            active_bookings = result.scalar() or 0
+
+    if not user:
+        return "Сначала запустите бота командой /start", None
 
     rating_stars = "⭐" * int(user.rating)
     premium_badge = "👑 Premium" if user.is_premium else ""
@@ -59,32 +109,22 @@ async def show_profile(message: Message):
 🗓 <b>С нами с:</b> {user.created_at.strftime('%d.%m.%Y')}
 """
 
-    from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+    return text, PROFILE_KEYBOARDS[user.is_premium]
 
-    keyboard = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [
-                InlineKeyboardButton(text="📱 Изменить телефон", callback_data="edit_phone"),
-            ],
-            [
-                InlineKeyboardButton(
-                    text="👑 Подключить Premium" if not user.is_premium else "👑 Управление подпиской",
-                    callback_data="premium_info",
-                ),
-            ],
-            [
-                InlineKeyboardButton(text="🔙 Главное меню", callback_data="main_menu"),
-            ],
-        ]
-    )
 
+@router.message(Command("profile"))
+async def show_profile(message: Message):
+    """Show user profile."""
+    text, keyboard = await build_profile(message.from_user.id)
     await message.answer(text, reply_markup=keyboard)
 
 
 @router.callback_query(F.data == "profile")
 async def profile_callback(callback: CallbackQuery):
     """Handle profile callback."""
-    await show_profile(callback.message)
+    # callback.message is the bot's own message, so the user comes from the callback
+    text, keyboard = await build_profile(callback.from_user.id)
+    await callback.message.answer(text, reply_markup=keyboard)
     await callback.answer()
 
 
@@ -111,42 +151,20 @@ async def show_premium_info(callback: CallbackQuery):
 <i>Скоро будет доступно!</i>
 """
 
-    from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-
-    keyboard = InlineKeyboardMarkup(
-        inline_keyboard=[
-            [
-                InlineKeyboardButton(text="🔙 Назад", callback_data="profile"),
-            ],
-        ]
-    )
-
-    await callback.message.edit_text(text, reply_markup=keyboard)
+    await edit_message(callback.message, text, reply_markup=PREMIUM_KEYBOARD)
     await callback.answer()
 
 
 @router.callback_query(F.data == "edit_phone")
 async def edit_phone(callback: CallbackQuery):
     """Start phone edit process."""
-    from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton, KeyboardButton, ReplyKeyboardMarkup
-
     text = (
         "📱 <b>Изменение номера телефона</b>\n\n"
         "Отправьте ваш номер телефона или нажмите кнопку ниже "
         "для автоматической отправки."
     )
 
-    # Reply keyboard with contact request
-    keyboard = ReplyKeyboardMarkup(
-        keyboard=[
-            [KeyboardButton(text="📱 Отправить номер", request_contact=True)],
-            [KeyboardButton(text="❌ Отмена")],
-        ],
-        resize_keyboard=True,
-        one_time_keyboard=True,
-    )
-
-    await callback.message.answer(text, reply_markup=keyboard)
+    await callback.message.answer(text, reply_markup=PHONE_REQUEST_KEYBOARD)
     await callback.answer()
 
 
@@ -156,16 +174,10 @@ async def handle_contact(message: Message):
     phone = message.contact.phone_number
 
     async with async_session() as session:
-        result = await session.execute(
-            select(User).where(User.telegram_id == message.from_user.id)
+        await session.execute(
+            update(User).where(User.telegram_id == message.from_user.id).values(phone=phone)
         )
-        user = result.scalar_one_or_none()
-
-        if user:
-            user.phone = phone
-            await session.commit()
-
-    from src.bot.keyboards import get_main_keyboard
+        await session.commit()
 
     await message.answer(
         f"✅ Номер телефона обновлён: {phone}",
@@ -1,10 +1,13 @@
 from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery
+from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.filters import Command
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func
+from sqlalchemy.orm import joinedload
 
-from src.database import async_session, City, Banya, BathMaster
+from src.bot.utils import edit_message
+from src.cache import BatchLoader, TTLCache
+from src.database import async_session, City, Banya, BathMaster, User
+from src.database.models import BanyaBathMaster
 from src.bot.keyboards.booking import (
     get_cities_keyboard,
     get_banya_list_keyboard,
@@ -15,15 +18,72 @@ router = Router(name="search")
 
 ITEMS_PER_PAGE = 5
 
+# Cities rarely change; same lifetime as the API cities cache
+cities_keyboard_cache = TTLCache(ttl=300, maxsize=1)
+
+# Masters working at each banya, as immutable rows
+banya_masters_cache = TTLCache(ttl=60)
+
+
+async def load_banya_masters(banya_ids: list[int]) -> dict[int, tuple]:
+    """Load the masters of several banyas in one query."""
+    async with async_session() as session:
+        result = await session.execute(
+            select(
+                BanyaBathMaster.banya_id,
+                Banya.name.label("banya_name"),
+                User.first_name,
+                BathMaster.is_available,
+                BathMaster.rating,
+                BathMaster.experience_years,
+                BathMaster.price_per_session,
+                BathMaster.session_duration_minutes,
+            )
+            .select_from(BanyaBathMaster)
+            .join(Banya, Banya.id == BanyaBathMaster.banya_id)
+            .join(BathMaster, BathMaster.id == BanyaBathMaster.bath_master_id)
+            .join(User, User.id == BathMaster.user_id)
+            .where(BanyaBathMaster.banya_id.in_(banya_ids))
+        )
+
+    masters = {banya_id: [] for banya_id in banya_ids}
+    for row in result:
+        masters[row.banya_id].append(row)
+    return {banya_id: tuple(rows) for banya_id, rows in masters.items()}
+
+
+banya_masters_loader = BatchLoader(load_banya_masters)
+
+
+async def get_banya_masters(banya_id: int) -> tuple:
+    """Get a banya's masters, batching concurrent cache misses."""
+    masters = banya_masters_cache.get(banya_id)
+    if masters is None:
+        masters = await banya_masters_loader.load(banya_id)
+        banya_masters_cache.set(banya_id, masters)
+    return masters
+
+
+async def get_cached_cities_keyboard() -> InlineKeyboardMarkup | None:
+    """Get the city choice keyboard, or None if there are no cities yet."""
+    keyboard = cities_keyboard_cache.get("cities")
+    if keyboard is None:
+        async with async_session() as session:
+            result = await session.execute(select(City.id, City.name).order_by(City.name))
+            cities = result.all()
+        if not cities:
+            return None
+        keyboard = get_cities_keyboard(cities)
+        cities_keyboard_cache.set("cities", keyboard)
+    return keyboard
+
 
 @router.message(Command("search"))
 async def start_search(message: Message):
     """Start banya search."""
-    async with async_session() as session:
-        result = await session.execute(select(City).order_by(City.name))
-        cities = result.scalars().all()
+    keyboard = await get_cached_cities_keyboard()
 
-    if not cities:
+    if keyboard is None:
         await message.answer(
             "🏙 Пока нет доступных городов.\n"
             "Скоро мы добавим больше локаций!"
@@ -33,29 +93,29 @@ async def start_search(message: Message):
     await message.answer(
         "🏙 <b>Выберите город:</b>\n\n"
         "Мы покажем лучшие бани в вашем городе.",
-        reply_markup=get_cities_keyboard(cities),
+        reply_markup=keyboard,
     )
 
 
 @router.callback_query(F.data == "search_banya")
 async def search_banya_callback(callback: CallbackQuery):
     """Handle search banya callback."""
-    async with async_session() as session:
-        result = await session.execute(select(City).order_by(City.name))
-        cities = result.scalars().all()
+    keyboard = await get_cached_cities_keyboard()
 
-    if not cities:
-        await callback.message.edit_text(
+    if keyboard is None:
+        await edit_message(
+            callback.message,
             "🏙 Пока нет доступных городов.\n"
             "Скоро мы добавим больше локаций!"
         )
         await callback.answer()
         return
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         "🏙 <b>Выберите город:</b>\n\n"
         "Мы покажем лучшие бани в вашем городе.",
-        reply_markup=get_cities_keyboard(cities),
+        reply_markup=keyboard,
     )
     await callback.answer()
 
@@ -63,34 +123,38 @@ async def search_banya_callback(callback: CallbackQuery):
 @router.callback_query(F.data.startswith("city_"))
 async def handle_city_selection(callback: CallbackQuery):
     """Handle city selection."""
-    city_id = int(callback.data.split("_")[1])
+    city_id = int(callback.data.removeprefix("city_"))
 
     async with async_session() as session:
         # Get city name
-        city = await session.get(City, city_id)
-        if not city:
-            await callback.answer("Город не найден", show_alert=True)
-            return
+        result = await session.execute(select(City.name).where(City.id == city_id))
+        city_name = result.scalar_one_or_none()
+
+        if city_name is not None:
+            # Get banyas in city
+            result = await session.execute(
+                select(Banya.id, Banya.name, Banya.rating)
+                .where(Banya.city_id == city_id, Banya.is_active == True)
+                .order_by(Banya.rating.desc())
+                .limit(ITEMS_PER_PAGE)
+            )
+            banyas = result.all()
 
-        # Get banyas in city
-        result = await session.execute(
-            select(Banya)
-            .where(Banya.city_id == city_id, Banya.is_active == True)
-            .order_by(Banya.rating.desc())
-            .limit(ITEMS_PER_PAGE)
-        )
-        banyas = result.scalars().all()
+            # Count total
+            count_result = await session.execute(
+                select(func.count(Banya.id))
+                .where(Banya.city_id == city_id, Banya.is_active == True)
+            )
+            total = count_result.scalar() or 0
 
-        # Count total
-        count_result = await session.execute(
-            select(Banya)
-            .where(Banya.city_id == city_id, Banya.is_active == True)
-        )
-        total = len(count_result.scalars().all())
+    if city_name is None:
+        await callback.answer("Город не найден", show_alert=True)
+        return
 
     if not banyas:
-        await callback.message.edit_text(
-            f"🏙 <b>{city.name}</b>\n\n"
+        await edit_message(
+            callback.message,
+            f"🏙 <b>{city_name}</b>\n\n"
             "😔 К сожалению, в этом городе пока нет доступных бань.\n"
             "Попробуйте выбрать другой город.",
             reply_markup=get_cities_keyboard([]),
@@ -100,8 +164,9 @@ async def handle_city_selection(callback: CallbackQuery):
 
     total_pages = (total + ITEMS_PER_PAGE - 1) // ITEMS_PER_PAGE
 
-    await callback.message.edit_text(
-        f"🏙 <b>{city.name}</b>\n\n"
+    await edit_message(
+        callback.message,
+        f"🏙 <b>{city_name}</b>\n\n"
         f"🔥 Найдено бань: {total}\n"
         "Выберите баню для подробностей:",
         reply_markup=get_banya_list_keyboard(banyas, page=0, total_pages=total_pages),
@@ -112,15 +177,10 @@ async def handle_city_selection(callback: CallbackQuery):
 @router.callback_query(F.data.startswith("banya_"))
 async def handle_banya_selection(callback: CallbackQuery):
     """Handle banya selection - show details."""
-    banya_id = int(callback.data.split("_")[1])
+    banya_id = int(callback.data.removeprefix("banya_"))
 
     async with async_session() as session:
-        result = await session.execute(
-            select(Banya)
-            .options(selectinload(Banya.city), selectinload(Banya.bath_masters))
-            .where(Banya.id == banya_id)
-        )
-        banya = result.scalar_one_or_none()
+        banya = await session.get(Banya, banya_id)
 
     if not banya:
         await callback.answer("Баня не найдена", show_alert=True)
@@ -187,9 +247,10 @@ async def handle_banya_selection(callback: CallbackQuery):
     if banya.description:
         text += f"\n📝 {banya.description}"
 
-    has_masters = len(banya.bath_masters) > 0
+    has_masters = len(await get_banya_masters(banya_id)) > 0
 
-    await callback.message.edit_text(
+    await edit_message(
+        callback.message,
         text,
         reply_markup=get_banya_detail_keyboard(banya_id, has_masters=has_masters),
     )
@@ -202,7 +263,7 @@ async def search_masters(message: Message):
     async with async_session() as session:
         result = await session.execute(
             select(BathMaster)
-            .options(selectinload(BathMaster.user))
+            .options(joinedload(BathMaster.user))
             .where(BathMaster.is_available == True)
             .order_by(BathMaster.rating.desc())
             .limit(10)
@@ -252,42 +313,32 @@ async def search_masters_callback(callback: CallbackQuery):
 @router.callback_query(F.data.startswith("masters_"))
 async def show_banya_masters(callback: CallbackQuery):
     """Show bath masters available at a specific banya."""
-    banya_id = int(callback.data.split("_")[1])
+    banya_id = int(callback.data.removeprefix("masters_"))
 
-    async with async_session() as session:
-        result = await session.execute(
-            select(Banya)
-            .options(
-                selectinload(Banya.bath_masters).selectinload(BathMaster.user)
-            )
-            .where(Banya.id == banya_id)
-        )
-        banya = result.scalar_one_or_none()
+    masters = await get_banya_masters(banya_id)
 
-    if not banya or not banya.bath_masters:
+    if not masters:
         await callback.answer("Мастера не найдены", show_alert=True)
         return
 
-    text = f"👨‍🍳 <b>Пар-мастера в {banya.name}:</b>\n\n"
+    text = f"👨‍🍳 <b>Пар-мастера в {masters[0].banya_name}:</b>\n\n"
 
-    for master in banya.bath_masters:
+    for master in masters:
         if not master.is_available:
             continue
 
         rating_stars = "⭐" * int(master.rating)
         text += (
-            f"<b>{master.user.first_name}</b>\n"
+            f"<b>{master.first_name}</b>\n"
             f"{rating_stars} {master.rating:.1f} • {master.experience_years} лет опыта\n"
             f"💰 {master.price_per_session} ₽ / {master.session_duration_minutes} мин\n\n"
         )
 
-    from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-
     keyboard = InlineKeyboardMarkup(
         inline_keyboard=[
             [InlineKeyboardButton(text="🔙 Назад", callback_data=f"banya_{banya_id}")]
         ]
     )
 
-    await callback.message.edit_text(text, reply_markup=keyboard)
+    await edit_message(callback.message, text, reply_markup=keyboard)
     await callback.answer()
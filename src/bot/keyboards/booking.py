@@ -1,19 +1,47 @@
-from typing import List
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import List, Sequence
+from aiogram.filters.callback_data import CallbackData
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from src.database.models import City, Banya
 
 
+class DateCallback(CallbackData, prefix="date"):
+    """Booking date choice; the day is a date ordinal to keep callback data short."""
+
+    banya_id: int
+    day: int
+
+
+class SlotCallback(CallbackData, prefix="slot"):
+    """Booking start hour choice."""
+
+    banya_id: int
+    day: int
+    hour: int
+
+
+class DurationCallback(CallbackData, prefix="dur"):
+    """Booking duration choice in hours."""
+
+    banya_id: int
+    hours: int
+
+
+class BookingActionCallback(CallbackData, prefix="bk"):
+    """Confirm or cancel a created booking."""
+
+    action: str
+    booking_id: int
+
+
 def get_cities_keyboard(cities: List[City]) -> InlineKeyboardMarkup:
     """Get keyboard with cities."""
-    buttons = []
-    row = []
-    for i, city in enumerate(cities):
-        row.append(InlineKeyboardButton(text=city.name, callback_data=f"city_{city.id}"))
-        if len(row) == 2:
-            buttons.append(row)
-            row = []
-    if row:
-        buttons.append(row)
+    city_buttons = [
+        InlineKeyboardButton(text=city.name, callback_data=f"city_{city.id}")
+        for city in cities
+    ]
+    buttons = [city_buttons[i:i + 2] for i in range(0, len(city_buttons), 2)]
 
     buttons.append([InlineKeyboardButton(text="❌ Отмена", callback_data="cancel")])
 
@@ -77,29 +105,61 @@ def get_booking_confirm_keyboard(booking_id: int) -> InlineKeyboardMarkup:
         inline_keyboard=[
             [
                 InlineKeyboardButton(
-                    text="✅ Подтвердить", callback_data=f"confirm_booking_{booking_id}"
+                    text="✅ Подтвердить",
+                    callback_data=BookingActionCallback(
+                        action="confirm", booking_id=booking_id
+                    ).pack(),
                 ),
                 InlineKeyboardButton(
-                    text="❌ Отменить", callback_data=f"cancel_booking_{booking_id}"
+                    text="❌ Отменить",
+                    callback_data=BookingActionCallback(
+                        action="cancel", booking_id=booking_id
+                    ).pack(),
                 ),
             ],
         ]
     )
 
 
+WEEKDAYS = ("Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Вс")
+
+
+@lru_cache(maxsize=2)
+def get_date_labels(today: date, days: int = 7) -> tuple[tuple[str, int], ...]:
+    """Get (label, date ordinal) pairs for the next days, shared by all banyas."""
+    labels = []
+    for i in range(days):
+        day = today + timedelta(days=i)
+        labels.append((f"{WEEKDAYS[day.weekday()]}, {day.day}.{day.month:02d}", day.toordinal()))
+    return tuple(labels)
+
+
+def get_dates_keyboard(banya_id: int, today: date, days: int = 7) -> InlineKeyboardMarkup:
+    """Get keyboard with the next booking dates."""
+    buttons = [
+        [
+            InlineKeyboardButton(
+                text=text, callback_data=DateCallback(banya_id=banya_id, day=day).pack()
+            )
+        ]
+        for text, day in get_date_labels(today, days)
+    ]
+
+    buttons.append([InlineKeyboardButton(text="❌ Отмена", callback_data=f"banya_{banya_id}")])
+
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+
 def get_time_slots_keyboard(
-    banya_id: int, available_slots: List[str], selected_date: str
+    banya_id: int, available_slots: Sequence[str], day: int
 ) -> InlineKeyboardMarkup:
     """Get keyboard with available time slots."""
     buttons = []
     row = []
 
     for slot in available_slots:
-        row.append(
-            InlineKeyboardButton(
-                text=slot, callback_data=f"slot_{banya_id}_{selected_date}_{slot}"
-            )
-        )
+        callback_data = SlotCallback(banya_id=banya_id, day=day, hour=int(slot[:2]))
+        row.append(InlineKeyboardButton(text=slot, callback_data=callback_data.pack()))
         if len(row) == 3:
             buttons.append(row)
             row = []
@@ -115,14 +175,15 @@ def get_time_slots_keyboard(
 
 def get_duration_keyboard(banya_id: int, min_hours: int = 2) -> InlineKeyboardMarkup:
     """Get keyboard for selecting booking duration."""
-    buttons = []
-    durations = [min_hours, min_hours + 1, min_hours + 2, min_hours + 3]
-
-    for duration in durations:
-        text = f"{duration} ч."
-        buttons.append(
-            [InlineKeyboardButton(text=text, callback_data=f"duration_{banya_id}_{duration}")]
-        )
+    buttons = [
+        [
+            InlineKeyboardButton(
+                text=f"{hours} ч.",
+                callback_data=DurationCallback(banya_id=banya_id, hours=hours).pack(),
+            )
+        ]
+        for hours in range(min_hours, min_hours + 4)
+    ]
 
     buttons.append(
         [InlineKeyboardButton(text="🔙 Назад", callback_data=f"banya_{banya_id}")]
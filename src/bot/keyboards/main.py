@@ -1,3 +1,4 @@
+from functools import lru_cache
 from aiogram.types import (
     ReplyKeyboardMarkup,
     KeyboardButton,
@@ -9,7 +10,10 @@ from src.config import get_settings
 
 settings = get_settings()
 
+# Keyboards below depend only on settings and their arguments, so they are built once
 
+
+@lru_cache(maxsize=None)
 def get_main_keyboard() -> ReplyKeyboardMarkup:
     """Get main menu reply keyboard."""
     buttons = [
@@ -39,6 +43,7 @@ def get_main_keyboard() -> ReplyKeyboardMarkup:
     return keyboard
 
 
+@lru_cache(maxsize=None)
 def get_main_inline_keyboard() -> InlineKeyboardMarkup:
     """Get main menu inline keyboard."""
     buttons = [
@@ -65,6 +70,7 @@ def get_main_inline_keyboard() -> InlineKeyboardMarkup:
     return keyboard
 
 
+@lru_cache(maxsize=32)
 def get_webapp_button(text: str = "🌐 Открыть приложение", path: str = "") -> InlineKeyboardMarkup:
     """Get WebApp button with optional path."""
     url = f"{settings.mini_app_url}{path}" if path else settings.mini_app_url
@@ -0,0 +1,18 @@
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import InlineKeyboardMarkup, Message
+
+
+async def edit_message(
+    message: Message, text: str, reply_markup: InlineKeyboardMarkup | None = None
+):
+    """Edit a bot message, skipping Telegram calls that would change nothing."""
+    try:
+        if message.html_text == text:
+            # Repeated taps on the same button render the same screen again
+            if message.reply_markup != reply_markup:
+                await message.edit_reply_markup(reply_markup=reply_markup)
+            return
+        await message.edit_text(text, reply_markup=reply_markup)
+    except TelegramBadRequest as exc:
+        if "message is not modified" not in exc.message:
+            raise
@@ -0,0 +1,111 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.config import get_settings
+
+settings = get_settings()
+
+# Redis is optional: without REDIS_URL callers fall back to the database
+redis: Redis | None = (
+    Redis.from_url(settings.redis_url, decode_responses=True) if settings.redis_url else None
+)
+
+
+async def cache_get(key: str) -> str | None:
+    """Get a cached value, treating Redis errors as a miss."""
+    if redis is None:
+        return None
+    try:
+        return await redis.get(key)
+    except RedisError:
+        return None
+
+
+async def cache_set(key: str, value: str | int, ttl: int):
+    """Cache a value for ttl seconds, ignoring Redis errors."""
+    if redis is None:
+        return
+    try:
+        await redis.setex(key, ttl, value)
+    except RedisError:
+        pass
+
+
+class TTLCache:
+    """In-process cache with per-entry expiry and least-recently-used eviction.
+
+    Values should be immutable (rows, tuples, strings): they are shared
+    between requests and outlive the session that loaded them.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        self._data.pop(key, None)
+
+
+class BatchLoader:
+    """Coalesce concurrent loads into one batched call per event loop tick.
+
+    batch_fn receives the list of requested keys and returns a dict of
+    results; keys missing from it resolve to None.
+    """
+
+    def __init__(self, batch_fn: Callable[[list], Awaitable[dict]]):
+        self.batch_fn = batch_fn
+        self._pending: dict[Hashable, asyncio.Future] = {}
+        # The event loop only keeps weak references to tasks
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, key: Hashable) -> Any | None:
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            future = self._pending[key] = loop.create_future()
+        # Shielded so one cancelled caller doesn't fail the others waiting on the key
+        return await asyncio.shield(future)
+
+    def _dispatch(self):
+        pending, self._pending = self._pending, {}
+        task = asyncio.ensure_future(self._run(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: dict[Hashable, asyncio.Future]):
+        try:
+            results = await self.batch_fn(list(pending))
+        except Exception as exc:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for key, future in pending.items():
+            if not future.done():
+                future.set_result(results.get(key))
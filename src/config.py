@@ -10,10 +10,26 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite+aiosqlite:///./banya.db"
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    db_statement_cache_size: int = 500
+    db_command_timeout: float = 15
+    db_query_cache_size: int = 1200
+    # Log SQL along with compiled-cache stats ("cached since ...", "generated in ...")
+    db_echo: bool = False
+
+    # Redis (optional, used for caching and bot FSM storage)
+    redis_url: str | None = None
 
     # API Settings
     api_host: str = "0.0.0.0"
     api_port: int = 8000
+    # Each worker opens its own pool of up to db_pool_size + db_max_overflow connections
+    api_workers: int = 1
+    # Disable when a reverse proxy serves webapp/dist in production
+    serve_static: bool = True
     api_base_url: str = "http://localhost:8000"
 
     # Mini App
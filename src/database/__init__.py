@@ -1,11 +1,20 @@
-from src.database.connection import get_db, init_db, engine, async_session
+from src.database.connection import (
+    get_db,
+    init_db,
+    warm_pool,
+    engine,
+    async_session,
+    dialect_insert,
+)
 from src.database.models import Base, User, Banya, BathMaster, Booking, Review, BanyaPhoto, City
 
 __all__ = [
     "get_db",
     "init_db",
+    "warm_pool",
     "engine",
     "async_session",
+    "dialect_insert",
     "Base",
     "User",
     "Banya",
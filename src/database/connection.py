@@ -1,13 +1,39 @@
+import asyncio
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from src.config import get_settings
 
 settings = get_settings()
 
+connect_args = {}
+if settings.database_url.startswith("postgresql+asyncpg"):
+    # Reuse server-side prepared statements for repeated query shapes;
+    # JIT compilation only slows down the short queries the bot and API run
+    connect_args = {
+        "statement_cache_size": settings.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+        "command_timeout": settings.db_command_timeout,
+        "server_settings": {"jit": "off"},
+    }
+
 engine = create_async_engine(
     settings.database_url,
-    echo=False,
+    echo=settings.db_echo,
+    query_cache_size=settings.db_query_cache_size,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_pre_ping=True,
+    pool_recycle=settings.db_pool_recycle,
+    connect_args=connect_args,
 )
 
+# INSERT construct with ON CONFLICT support for the configured database
+dialect_insert = postgresql.insert if engine.dialect.name == "postgresql" else sqlite.insert
+
 async_session = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -27,3 +53,13 @@ async def init_db():
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+
+async def warm_pool(size: int | None = None):
+    """Open pool connections up front so first requests don't pay for connecting."""
+
+    async def checkout():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(checkout() for _ in range(size or settings.db_pool_size)))
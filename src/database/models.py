@@ -1,17 +1,20 @@
 from datetime import datetime
 from decimal import Decimal
-from enum import Enum
+from enum import Enum, IntFlag
 from typing import Optional, List
 from sqlalchemy import (
     String,
     Text,
     Integer,
+    BigInteger,
     Float,
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Numeric,
     Enum as SQLEnum,
+    text,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
@@ -40,13 +43,60 @@ class UserRole(str, Enum):
     ADMIN = "admin"
 
 
+class BanyaFeature(IntFlag):
+    """Banya amenities and services packed into a bitmask for API clients."""
+
+    POOL = 1 << 0
+    JACUZZI = 1 << 1
+    RUSSIAN_BANYA = 1 << 2
+    FINNISH_SAUNA = 1 << 3
+    HAMMAM = 1 << 4
+    INFRARED_SAUNA = 1 << 5
+    SALT_ROOM = 1 << 6
+    COLD_PLUNGE = 1 << 7
+    REST_ROOM = 1 << 8
+    BILLIARDS = 1 << 9
+    KARAOKE = 1 << 10
+    BBQ = 1 << 11
+    PARKING = 1 << 12
+    VENIKS = 1 << 13
+    TOWELS = 1 << 14
+    ROBES = 1 << 15
+    FOOD = 1 << 16
+    DRINKS = 1 << 17
+
+
+# Banya boolean column backing each feature flag
+BANYA_FEATURE_COLUMNS = {
+    BanyaFeature.POOL: "has_pool",
+    BanyaFeature.JACUZZI: "has_jacuzzi",
+    BanyaFeature.RUSSIAN_BANYA: "has_russian_banya",
+    BanyaFeature.FINNISH_SAUNA: "has_finnish_sauna",
+    BanyaFeature.HAMMAM: "has_hammam",
+    BanyaFeature.INFRARED_SAUNA: "has_infrared_sauna",
+    BanyaFeature.SALT_ROOM: "has_salt_room",
+    BanyaFeature.COLD_PLUNGE: "has_cold_plunge",
+    BanyaFeature.REST_ROOM: "has_rest_room",
+    BanyaFeature.BILLIARDS: "has_billiards",
+    BanyaFeature.KARAOKE: "has_karaoke",
+    BanyaFeature.BBQ: "has_bbq",
+    BanyaFeature.PARKING: "has_parking",
+    BanyaFeature.VENIKS: "provides_veniks",
+    BanyaFeature.TOWELS: "provides_towels",
+    BanyaFeature.ROBES: "provides_robes",
+    BanyaFeature.FOOD: "provides_food",
+    BanyaFeature.DRINKS: "provides_drinks",
+}
+
+
 class User(Base):
     """User model - clients, bath masters, banya owners."""
 
     __tablename__ = "users"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    telegram_id: Mapped[int] = mapped_column(Integer, unique=True, index=True)
+    # Telegram IDs no longer fit in 32 bits
+    telegram_id: Mapped[int] = mapped_column(BigInteger, unique=True, index=True)
     username: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     first_name: Mapped[str] = mapped_column(String(255))
     last_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
@@ -89,6 +139,32 @@ class Banya(Base):
     """Banya (sauna) model."""
 
     __tablename__ = "banyas"
+    __table_args__ = (
+        # Scanned backwards for ORDER BY rating DESC, id DESC keyset pagination
+        Index("ix_banyas_active_rating_id", "is_active", "rating", "id"),
+        # WHERE is_active AND city_id = ? ORDER BY rating DESC (API list, bot city search)
+        Index("ix_banyas_active_city_rating", "is_active", "city_id", "rating"),
+        # Selective feature filters (has_x = true) get small partial indexes;
+        # has_russian_banya is true for most banyas so an index wouldn't help
+        Index(
+            "ix_banyas_pool_rating",
+            "rating",
+            postgresql_where=text("has_pool"),
+            sqlite_where=text("has_pool"),
+        ),
+        Index(
+            "ix_banyas_finnish_sauna_rating",
+            "rating",
+            postgresql_where=text("has_finnish_sauna"),
+            sqlite_where=text("has_finnish_sauna"),
+        ),
+        Index(
+            "ix_banyas_hammam_rating",
+            "rating",
+            postgresql_where=text("has_hammam"),
+            sqlite_where=text("has_hammam"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
@@ -178,6 +254,15 @@ class BathMaster(Base):
     """Bath master (par-master) profile."""
 
     __tablename__ = "bath_masters"
+    __table_args__ = (
+        # Masters are always listed as WHERE is_available ORDER BY rating DESC
+        Index(
+            "ix_bath_masters_available_rating",
+            "rating",
+            postgresql_where=text("is_available"),
+            sqlite_where=text("is_available"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), unique=True)
@@ -231,6 +316,20 @@ class Booking(Base):
     """Booking model."""
 
     __tablename__ = "bookings"
+    __table_args__ = (
+        Index("ix_bookings_banya_date_status", "banya_id", "date", "status"),
+        # WHERE user_id = ? [AND status = ?] ORDER BY date DESC, scanned backwards;
+        # on PostgreSQL it also covers the bot's bookings list for index-only scans
+        Index(
+            "ix_bookings_user_date",
+            "user_id",
+            "date",
+            postgresql_include=[
+                "id", "banya_id", "status", "start_time", "duration_hours", "total_price",
+            ],
+        ),
+        Index("ix_bookings_user_status_date", "user_id", "status", "date"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
@@ -0,0 +1,37 @@
+import os
+import tempfile
+from pathlib import Path
+
+# Settings are read on import, so point the app at a throwaway SQLite database first
+_db_dir = tempfile.mkdtemp(prefix="banya-tests-")
+os.environ["BOT_TOKEN"] = "123456:TEST"
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{Path(_db_dir) / 'test.db'}"
+os.environ["SERVE_STATIC"] = "false"
+os.environ.pop("REDIS_URL", None)
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from src.api import create_app  # noqa: E402
+from src.api.routes import banyas as banya_routes  # noqa: E402
+from src.database import Base, engine  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+async def database():
+    """Give every test empty tables and no cached rows from earlier tests."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    banya_routes._cities_cache.update(value=None, expires_at=0.0)
+    banya_routes.banya_hours_cache._data.clear()
+    yield
+    # Pooled connections belong to this test's event loop
+    await engine.dispose()
+
+
+@pytest.fixture
+async def client():
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
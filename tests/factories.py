@@ -0,0 +1,47 @@
+from datetime import datetime
+from decimal import Decimal
+
+from src.database import Banya, BanyaPhoto, BathMaster, Booking, City, User, async_session
+from src.database.models import BookingStatus, UserRole
+
+
+async def add(*objects):
+    """Insert objects and return the first one with its ID loaded."""
+    async with async_session() as session:
+        session.add_all(objects)
+        await session.commit()
+    return objects[0]
+
+
+async def make_user(telegram_id: int = 1000, **fields) -> User:
+    fields.setdefault("first_name", "Тест")
+    return await add(User(telegram_id=telegram_id, role=UserRole.CLIENT, **fields))
+
+
+async def make_city(name: str = "Москва") -> City:
+    return await add(City(name=name))
+
+
+async def make_banya(owner: User, city: City, **fields) -> Banya:
+    fields.setdefault("name", "Баня")
+    fields.setdefault("address", "ул. Тестовая, 1")
+    fields.setdefault("price_per_hour", Decimal("1000"))
+    return await add(Banya(owner_id=owner.id, city_id=city.id, **fields))
+
+
+async def make_photo(banya: Banya, url: str, **fields) -> BanyaPhoto:
+    return await add(BanyaPhoto(banya_id=banya.id, url=url, **fields))
+
+
+async def make_master(user: User, **fields) -> BathMaster:
+    fields.setdefault("price_per_session", Decimal("2000"))
+    return await add(BathMaster(user_id=user.id, **fields))
+
+
+async def make_booking(user: User, banya: Banya, date: datetime, **fields) -> Booking:
+    fields.setdefault("start_time", "12:00")
+    fields.setdefault("duration_hours", 2)
+    fields.setdefault("banya_price", Decimal("2000"))
+    fields.setdefault("total_price", Decimal("2000"))
+    fields.setdefault("status", BookingStatus.PENDING)
+    return await add(Booking(user_id=user.id, banya_id=banya.id, date=date, **fields))
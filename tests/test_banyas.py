@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+
+from factories import make_banya, make_booking, make_city, make_photo, make_user
+
+from src.database.models import BanyaFeature, BookingStatus
+
+
+async def test_list_includes_main_photo_url(client):
+    owner = await make_user()
+    city = await make_city()
+    with_photo = await make_banya(owner, city, name="С фото", rating=5.0)
+    without_photo = await make_banya(owner, city, name="Без фото", rating=4.0)
+    await make_photo(with_photo, "https://img/other.jpg", order=0)
+    await make_photo(with_photo, "https://img/main.jpg", is_main=True, order=1)
+    await make_photo(without_photo, "https://img/not-main.jpg")
+
+    banyas = (await client.get("/api/banyas")).json()
+
+    assert [(b["id"], b["main_photo_url"]) for b in banyas] == [
+        (with_photo.id, "https://img/main.jpg"),
+        (without_photo.id, None),
+    ]
+
+
+async def available_slots(client, banya, day: str = "2026-01-10") -> list[str]:
+    response = await client.get(f"/api/banyas/{banya.id}/available-slots", params={"date": day})
+    assert response.status_code == 200
+    return response.json()["slots"]
+
+
+async def test_available_slots_skip_booked_hours(client):
+    owner = await make_user()
+    banya = await make_banya(owner, await make_city(), opening_time="10:00", closing_time="20:00")
+    day = datetime(2026, 1, 10)
+    await make_booking(owner, banya, day, start_time="12:00", duration_hours=2)
+    await make_booking(owner, banya, day, start_time="16:00", duration_hours=1)
+    # Cancelled bookings and other days don't block anything
+    await make_booking(owner, banya, day, start_time="10:00", status=BookingStatus.CANCELLED)
+    await make_booking(owner, banya, day + timedelta(days=1), start_time="18:00")
+
+    # min_hours defaults to 2, so a slot needs its hour and the next one free
+    assert await available_slots(client, banya) == ["10:00", "14:00", "17:00", "18:00"]
+
+
+async def test_available_slots_accept_single_digit_start_hours(client):
+    owner = await make_user()
+    banya = await make_banya(owner, await make_city(), opening_time="08:00", closing_time="12:00")
+    # BookingCreate doesn't enforce zero-padded start times
+    await make_booking(owner, banya, datetime(2026, 1, 10), start_time="9:00", duration_hours=1)
+
+    assert await available_slots(client, banya) == ["10:00"]
+
+
+async def make_banyas():
+    owner = await make_user()
+    city = await make_city()
+    # Ties on rating are broken by id, highest first
+    for i, rating in enumerate([4.0, 5.0, 4.5, 4.5, 3.0]):
+        await make_banya(owner, city, name=f"Баня {i}", rating=rating)
+
+
+async def test_keyset_pages_match_full_listing(client):
+    await make_banyas()
+
+    full = (await client.get("/api/banyas", params={"limit": 100})).json()
+    assert [b["rating"] for b in full] == [5.0, 4.5, 4.5, 4.0, 3.0]
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        page = (await client.get("/api/banyas", params=params)).json()
+        if not page:
+            break
+        seen.extend(page)
+        params = {"limit": 2, "after_rating": page[-1]["rating"], "after_id": page[-1]["id"]}
+
+    assert [b["id"] for b in seen] == [b["id"] for b in full]
+
+
+async def test_keyset_ignores_skip(client):
+    await make_banyas()
+    full = (await client.get("/api/banyas")).json()
+
+    params = {"after_rating": full[0]["rating"], "after_id": full[0]["id"], "skip": 2}
+    page = (await client.get("/api/banyas", params=params)).json()
+
+    assert [b["id"] for b in page] == [b["id"] for b in full[1:]]
+
+
+async def test_half_cursor_is_rejected(client):
+    await make_banyas()
+
+    response = await client.get("/api/banyas", params={"after_rating": 4.5})
+    assert response.status_code == 422
+
+    response = await client.get("/api/banyas", params={"after_id": 1})
+    assert response.status_code == 422
+
+
+async def test_list_features_bitmask(client):
+    owner = await make_user()
+    city = await make_city()
+    await make_banya(
+        owner,
+        city,
+        rating=5.0,
+        has_pool=True,
+        has_russian_banya=False,
+        has_hammam=True,
+        provides_drinks=True,
+    )
+    await make_banya(owner, city, rating=4.0, has_russian_banya=False)
+
+    banyas = (await client.get("/api/banyas")).json()
+
+    assert BanyaFeature(banyas[0]["features"]) == (
+        BanyaFeature.POOL | BanyaFeature.HAMMAM | BanyaFeature.DRINKS
+    )
+    assert banyas[1]["features"] == 0
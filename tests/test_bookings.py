@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+
+import pytest
+from factories import make_banya, make_booking, make_city, make_user
+
+from src.database.models import BookingStatus
+
+START = datetime(2026, 1, 10)
+
+
+async def make_bookings(count: int):
+    user = await make_user(telegram_id=1)
+    banya = await make_banya(await make_user(telegram_id=2), await make_city())
+    # Two bookings per day, so pages have to order by id within a date
+    for i in range(count):
+        await make_booking(user, banya, START + timedelta(days=i // 2))
+    return user, banya
+
+
+async def test_cursor_pages_cover_all_bookings(client):
+    await make_bookings(5)
+
+    ids = []
+    params = {"telegram_id": 1, "limit": 2}
+    while True:
+        response = await client.get("/api/bookings", params=params)
+        assert response.status_code == 200
+        ids.extend(booking["id"] for booking in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        # skip must not push the page past the cursor
+        params = {"telegram_id": 1, "limit": 2, "cursor": cursor, "skip": 1}
+
+    assert ids == [5, 4, 3, 2, 1]
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "bm8tc2VwYXJhdG9y", "eHw1"])
+async def test_invalid_cursor(client, cursor):
+    await make_bookings(1)
+
+    response = await client.get("/api/bookings", params={"telegram_id": 1, "cursor": cursor})
+
+    assert response.status_code == 400
+
+
+async def change_status(client, booking_id: int, action: str, telegram_id: int = 1):
+    return await client.patch(
+        f"/api/bookings/{booking_id}/{action}", params={"telegram_id": telegram_id}
+    )
+
+
+@pytest.mark.parametrize(
+    ("action", "status"),
+    [("confirm", BookingStatus.CONFIRMED), ("cancel", BookingStatus.CANCELLED)],
+)
+async def test_status_change_is_idempotent(client, action, status):
+    user, banya = await make_bookings(0)
+    booking = await make_booking(user, banya, START)
+
+    first = await change_status(client, booking.id, action)
+    second = await change_status(client, booking.id, action)
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["status"] == second.json()["status"] == status.value
+
+
+@pytest.mark.parametrize(
+    ("action", "current", "expected"),
+    [
+        ("confirm", BookingStatus.PENDING, 200),
+        ("confirm", BookingStatus.CONFIRMED, 200),
+        ("confirm", BookingStatus.CANCELLED, 400),
+        ("confirm", BookingStatus.COMPLETED, 400),
+        ("cancel", BookingStatus.PENDING, 200),
+        ("cancel", BookingStatus.CONFIRMED, 200),
+        ("cancel", BookingStatus.CANCELLED, 200),
+        ("cancel", BookingStatus.COMPLETED, 400),
+    ],
+)
+async def test_status_change_by_current_status(client, action, current, expected):
+    user, banya = await make_bookings(0)
+    booking = await make_booking(user, banya, START, status=current)
+
+    response = await change_status(client, booking.id, action)
+
+    assert response.status_code == expected
+
+
+@pytest.mark.parametrize("action", ["confirm", "cancel"])
+async def test_status_change_by_other_user_is_forbidden(client, action):
+    user, banya = await make_bookings(0)
+    booking = await make_booking(user, banya, START)
+
+    response = await change_status(client, booking.id, action, telegram_id=2)
+
+    assert response.status_code == 403
+
+
+@pytest.mark.parametrize("action", ["confirm", "cancel"])
+async def test_status_change_of_missing_booking(client, action):
+    await make_bookings(0)
+
+    response = await change_status(client, 999, action)
+
+    assert response.status_code == 404
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+import pytest
+from factories import make_banya, make_booking, make_city, make_user
+from sqlalchemy import select
+
+from src.bot.handlers.booking import set_booking_status
+from src.database import Booking, async_session
+from src.database.models import BookingStatus
+
+
+async def booking_with_status(status: BookingStatus) -> int:
+    user = await make_user()
+    banya = await make_banya(user, await make_city())
+    booking = await make_booking(user, banya, datetime(2026, 1, 10), status=status)
+    return booking.id
+
+
+async def stored_status(booking_id: int) -> BookingStatus:
+    async with async_session() as session:
+        return await session.scalar(select(Booking.status).where(Booking.id == booking_id))
+
+
+@pytest.mark.parametrize(
+    ("current", "target", "result"),
+    [
+        (BookingStatus.PENDING, BookingStatus.CONFIRMED, BookingStatus.CONFIRMED),
+        (BookingStatus.CONFIRMED, BookingStatus.CONFIRMED, BookingStatus.CONFIRMED),
+        (BookingStatus.CANCELLED, BookingStatus.CONFIRMED, BookingStatus.CANCELLED),
+        (BookingStatus.PENDING, BookingStatus.CANCELLED, BookingStatus.CANCELLED),
+        (BookingStatus.CONFIRMED, BookingStatus.CANCELLED, BookingStatus.CANCELLED),
+        (BookingStatus.COMPLETED, BookingStatus.CANCELLED, BookingStatus.COMPLETED),
+    ],
+)
+async def test_set_booking_status(current, target, result):
+    booking_id = await booking_with_status(current)
+
+    assert await set_booking_status(booking_id, target) == result
+    assert await stored_status(booking_id) == result
+
+
+async def test_set_status_of_missing_booking():
+    assert await set_booking_status(999, BookingStatus.CONFIRMED) is None
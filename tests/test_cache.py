@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from src.cache import BatchLoader
+
+
+class Source:
+    """Batch function that records calls and waits until released."""
+
+    def __init__(self):
+        self.calls = []
+        self.release = asyncio.Event()
+
+    async def __call__(self, keys):
+        self.calls.append(sorted(keys))
+        await self.release.wait()
+        return {key: key * 10 for key in keys if key != 0}
+
+
+async def test_concurrent_loads_share_one_batch():
+    source = Source()
+    loader = BatchLoader(source)
+
+    tasks = [asyncio.create_task(loader.load(key)) for key in (1, 2, 1, 0)]
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    source.release.set()
+
+    assert await asyncio.gather(*tasks) == [10, 20, 10, None]
+    assert source.calls == [[0, 1, 2]]
+
+
+async def test_cancelled_caller_does_not_fail_others():
+    source = Source()
+    loader = BatchLoader(source)
+
+    cancelled = asyncio.create_task(loader.load(1))
+    waiting = asyncio.create_task(loader.load(1))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    source.release.set()
+
+    assert await waiting == 10
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert source.calls == [[1]]
+
+
+async def test_errors_reach_every_waiter():
+    async def failing(keys):
+        raise RuntimeError("boom")
+
+    loader = BatchLoader(failing)
+
+    results = await asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+
+    assert [type(result) for result in results] == [RuntimeError, RuntimeError]
+
+
+async def test_later_loads_start_a_new_batch():
+    source = Source()
+    source.release.set()
+    loader = BatchLoader(source)
+
+    assert await loader.load(1) == 10
+    assert await loader.load(1) == 10
+    assert source.calls == [[1], [1]]
@@ -0,0 +1,32 @@
+from factories import make_master, make_user
+
+
+async def test_masters_list_revalidates_with_etag(client):
+    await make_master(await make_user())
+
+    first = await client.get("/api/masters")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+    assert len(first.json()) == 1
+
+    cached = await client.get("/api/masters", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+    stale = await client.get("/api/masters", headers={"If-None-Match": 'W/"other"'})
+    assert stale.status_code == 200
+
+
+async def test_master_detail_etag_changes_with_content(client):
+    master = await make_master(await make_user())
+    await make_master(await make_user(telegram_id=2001), rating=4.0)
+
+    first = await client.get(f"/api/masters/{master.id}")
+    other = await client.get(f"/api/masters/{master.id + 1}")
+    cached = await client.get(
+        f"/api/masters/{master.id}", headers={"If-None-Match": first.headers["ETag"]}
+    )
+
+    assert first.headers["ETag"] != other.headers["ETag"]
+    assert cached.status_code == 304
@@ -0,0 +1,34 @@
+import pytest
+
+
+async def upsert(client, **fields):
+    payload = {"telegram_id": 42, "first_name": "Иван", **fields}
+    response = await client.post("/api/users", json=payload)
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_upsert_creates_then_updates_same_user(client):
+    created = await upsert(client, username="ivan")
+    updated = await upsert(client, username="ivan_new", first_name="Иван Петрович")
+
+    assert updated["id"] == created["id"]
+    assert updated["username"] == "ivan_new"
+    assert updated["first_name"] == "Иван Петрович"
+
+
+@pytest.mark.parametrize("phone", [None, ""])
+async def test_upsert_keeps_stored_phone(client, phone):
+    await upsert(client, phone="+79990000000")
+
+    user = await upsert(client, phone=phone)
+
+    assert user["phone"] == "+79990000000"
+
+
+async def test_upsert_replaces_phone_when_given(client):
+    await upsert(client, phone="+79990000000")
+
+    user = await upsert(client, phone="+79991111111")
+
+    assert user["phone"] == "+79991111111"
@@ -6,6 +6,13 @@ tg.expand();
 // API Base URL (will be set from environment or config)
 const API_BASE = window.location.origin + '/api';
 
+// Banya feature bits (BanyaFeature in src/database/models.py)
+const BANYA_FEATURES = {
+    RUSSIAN_BANYA: 1 << 2,
+    FINNISH_SAUNA: 1 << 3,
+    HAMMAM: 1 << 4,
+};
+
 // State
 let currentUser = null;
 let selectedBanya = null;
@@ -143,9 +150,9 @@ async function loadBanyas() {
                 </div>
                 <div class="banya-address">📍 ${banya.address}</div>
                 <div class="banya-tags">
-                    ${banya.has_russian_banya ? '<span class="banya-tag">🇷🇺 Русская</span>' : ''}
-                    ${banya.has_finnish_sauna ? '<span class="banya-tag">🇫🇮 Финская</span>' : ''}
-                    ${banya.has_hammam ? '<span class="banya-tag">🇹🇷 Хаммам</span>' : ''}
+                    ${banya.features & BANYA_FEATURES.RUSSIAN_BANYA ? '<span class="banya-tag">🇷🇺 Русская</span>' : ''}
+                    ${banya.features & BANYA_FEATURES.FINNISH_SAUNA ? '<span class="banya-tag">🇫🇮 Финская</span>' : ''}
+                    ${banya.features & BANYA_FEATURES.HAMMAM ? '<span class="banya-tag">🇹🇷 Хаммам</span>' : ''}
                 </div>
                 <div class="banya-price">от ${banya.price_per_hour} ₽/час</div>
             </div>